@@ -12,11 +12,11 @@ Setup required:
 See docs/NEST_API_SETUP.md for detailed setup instructions.
 """
 
-import requests
 import logging
 import time
 from datetime import datetime, timedelta
 from lib.logging_config import kvlog
+from lib.http_session import create_session
 
 logger = logging.getLogger(__name__)
 
@@ -50,6 +50,9 @@ class NestAPI:
         self.timeout_status = timeouts.get('status', 5)
         self.timeout_control = timeouts.get('control', 10)
 
+        # Pooled HTTP session: reuses TLS connections across API calls
+        self.session = create_session()
+
         # Ensure we have valid credentials
         if not all([self.project_id, self.device_id, self.client_id,
                     self.client_secret, self.refresh_token]):
@@ -69,7 +72,7 @@ class NestAPI:
 
         api_start = time.time()
         try:
-            resp = requests.post(self.TOKEN_URL, data={
+            resp = self.session.post(self.TOKEN_URL, data={
                 'client_id': self.client_id,
                 'client_secret': self.client_secret,
                 'refresh_token': self.refresh_token,
@@ -99,7 +102,7 @@ class NestAPI:
         api_start = time.time()
         try:
             url = f"{self.BASE_URL}/{endpoint}"
-            resp = requests.get(url, headers={
+            resp = self.session.get(url, headers={
                 "Authorization": f"Bearer {self.access_token}"
             }, timeout=self.timeout_status)
 
@@ -124,7 +127,7 @@ class NestAPI:
         api_start = time.time()
         try:
             url = f"{self.BASE_URL}/{endpoint}"
-            resp = requests.post(url,
+            resp = self.session.post(url,
                 headers={"Authorization": f"Bearer {self.access_token}"},
                 json=data,
                 timeout=self.timeout_control
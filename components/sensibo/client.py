@@ -9,10 +9,10 @@ Setup:
 3. Get device ID by running: python scripts/list_sensibo_devices.py
 """
 
-import requests
 import logging
 import time
 from lib.logging_config import kvlog
+from lib.http_session import create_session
 
 logger = logging.getLogger(__name__)
 
@@ -38,6 +38,9 @@ class SensiboAPI:
         self.timeout_status = timeouts.get('status', 5)
         self.timeout_control = timeouts.get('control', 10)
 
+        # Pooled HTTP session: reuses TLS connections across API calls
+        self.session = create_session()
+
         if not self.api_key:
             raise ValueError(
                 "Sensibo API key not configured. "
@@ -53,7 +56,7 @@ class SensiboAPI:
         api_start = time.time()
         try:
             url = f"{self.BASE_URL}/{endpoint}"
-            resp = requests.get(url, params=params, timeout=self.timeout_status)
+            resp = self.session.get(url, params=params, timeout=self.timeout_status)
             resp.raise_for_status()
 
             data = resp.json()
@@ -77,7 +80,7 @@ class SensiboAPI:
             url = f"{self.BASE_URL}/{endpoint}"
             params = {'apiKey': self.api_key}
 
-            resp = requests.patch(url, params=params, json=data, timeout=self.timeout_control)
+            resp = self.session.patch(url, params=params, json=data, timeout=self.timeout_control)
             resp.raise_for_status()
 
             result = resp.json()
@@ -101,7 +104,7 @@ class SensiboAPI:
             url = f"{self.BASE_URL}/{endpoint}"
             params = {'apiKey': self.api_key}
 
-            resp = requests.post(url, params=params, json=data, timeout=self.timeout_control)
+            resp = self.session.post(url, params=params, json=data, timeout=self.timeout_control)
             resp.raise_for_status()
 
             result = resp.json()
@@ -0,0 +1,38 @@
+"""
+Shared HTTP session factory
+
+Cloud API clients (Nest, Sensibo, Temp Stick) are long-lived singletons.
+A pooled requests.Session keeps the TCP+TLS connection to each vendor open
+between calls, instead of paying a fresh handshake on every dashboard poll.
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+def create_session(pool_connections=10, pool_maxsize=20):
+    """
+    Create a requests.Session with connection pooling and connect retries
+
+    Only connection failures are retried, once: the request never reached
+    the server, so retrying is safe for POST/PATCH too. Read errors and error
+    statuses go straight back to the caller (a retry would multiply the
+    dashboard's wait on a slow vendor).
+
+    Args:
+        pool_connections: Number of host pools to keep
+        pool_maxsize: Connections kept per host (concurrent dashboard polls)
+
+    Returns:
+        requests.Session
+    """
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=Retry(total=1, read=0, backoff_factor=0.2)
+    )
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
@@ -4,7 +4,9 @@ HVAC logic helpers for smart mode selection and temperature control.
 Shared logic used by both Nest and Sensibo components.
 """
 
+import time
 import logging
+from functools import lru_cache
 from lib.config import get
 
 logger = logging.getLogger(__name__)
@@ -121,4 +123,27 @@ def is_sleep_time():
     return is_sleep
 
 
-__all__ = ['select_hvac_mode', 'get_outdoor_temp', 'is_sleep_time']
+# Seconds is_sleep_time_cached() reuses an answer (schedule is minute-granular)
+SLEEP_TIME_CACHE_SECONDS = 30
+
+
+@lru_cache(maxsize=1)
+def _sleep_time_bucketed(bucket):
+    """is_sleep_time() evaluated once per time bucket"""
+    return is_sleep_time()
+
+
+def is_sleep_time_cached():
+    """
+    is_sleep_time() memoized for SLEEP_TIME_CACHE_SECONDS.
+
+    For frequently polled status endpoints; the answer may lag a schedule
+    boundary by up to SLEEP_TIME_CACHE_SECONDS.
+
+    Returns:
+        bool: True if it's sleep time
+    """
+    return _sleep_time_bucketed(int(time.time() // SLEEP_TIME_CACHE_SECONDS))
+
+
+__all__ = ['select_hvac_mode', 'get_outdoor_temp', 'is_sleep_time', 'is_sleep_time_cached']
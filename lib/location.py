@@ -13,11 +13,27 @@ from datetime import datetime
 from typing import Dict, Optional, Tuple
 from lib.logging_config import kvlog
 
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    # Fallback to stdlib json if orjson not installed
+    _json_loads = json.loads
+
 logger = logging.getLogger(__name__)
 
 # Location data file (stores last known location)
 LOCATION_FILE = os.path.join(os.path.dirname(__file__), '..', 'data', 'location.json')
 
+# Reuse ETA results for the same origin for this long (avoids repeat Maps calls)
+ETA_CACHE_TTL_SECONDS = 30
+
+# Origins are compared at this many decimal places (~100 m), so GPS jitter
+# between polls still hits the cache
+ETA_CACHE_ORIGIN_DECIMALS = 3
+
+# Last ETA result: (origin, expires_at monotonic, result)
+_eta_cache = (None, 0.0, None)
+
 
 def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     """
@@ -124,8 +140,8 @@ def get_location() -> Optional[Dict]:
         return None
 
     try:
-        with open(LOCATION_FILE, 'r') as f:
-            data = json.load(f)
+        with open(LOCATION_FILE, 'rb') as f:
+            data = _json_loads(f.read())
 
         # Calculate age
         timestamp = datetime.fromisoformat(data['timestamp'].replace('Z', '+00:00'))
@@ -140,10 +156,13 @@ def get_location() -> Optional[Dict]:
         return None
 
 
-def get_eta_home() -> Optional[Dict]:
+def get_eta_home(fresh: bool = False) -> Optional[Dict]:
     """
     Calculate ETA to home using Google Maps API
 
+    Args:
+        fresh: Skip the cached result and query Maps (the new result is cached)
+
     Returns:
         dict or None: ETA information:
         {
@@ -156,6 +175,8 @@ def get_eta_home() -> Optional[Dict]:
             'destination': {'lat', 'lng'}
         }
     """
+    global _eta_cache
+
     start_time = time.time()
     location = get_location()
     if not location:
@@ -163,6 +184,13 @@ def get_eta_home() -> Optional[Dict]:
               result='no_location_data')
         return None
 
+    # Serve from cache if origin unchanged and entry still fresh
+    origin_key = (round(location['lat'], ETA_CACHE_ORIGIN_DECIMALS),
+                  round(location['lng'], ETA_CACHE_ORIGIN_DECIMALS))
+    cached_origin, expires_at, cached_result = _eta_cache
+    if not fresh and cached_origin == origin_key and time.monotonic() < expires_at:
+        return cached_result
+
     from lib.config import config
     from services.google_maps import get_travel_time
 
@@ -187,6 +215,8 @@ def get_eta_home() -> Optional[Dict]:
             'destination': {'lat': home['lat'], 'lng': home['lng']}
         }
 
+        _eta_cache = (origin_key, time.monotonic() + ETA_CACHE_TTL_SECONDS, result)
+
         duration_ms = int((time.time() - start_time) * 1000)
         kvlog(logger, logging.INFO, module='location', action='get_eta_home',
               result='ok', eta_minutes=travel['duration_in_traffic_minutes'],
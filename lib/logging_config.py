@@ -13,9 +13,12 @@ Categories:
 - SYS: System events
 """
 
+import atexit
 import logging
 import os
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
 
 # Add custom NOTICE level (between INFO and WARNING)
 # Used for normal operational events worth recording
@@ -23,6 +26,21 @@ logging.NOTICE = 25
 logging.addLevelName(25, 'NOTICE')
 
 
+# Background writer for the active setup_logging() configuration
+_queue_listener = None
+
+
+def _stop_queue_listener():
+    """Flush queued records and stop the writer thread"""
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
+
+atexit.register(_stop_queue_listener)
+
+
 class CategoryFilter(logging.Filter):
     """Add category to log records based on logger name"""
 
@@ -167,7 +185,10 @@ def kvlog(logger, level, **kwargs):
         - Values with spaces/special chars are automatically quoted
         - Quotes and backslashes within values are escaped
         - Simple values (numbers, single words) stay unquoted for readability
+        - Nothing is formatted when the logger has `level` disabled
     """
+    if not logger.isEnabledFor(level):
+        return
     msg = ' '.join(f'{k}={_format_value(v)}' for k, v in kwargs.items())
     logger.log(level, msg)
 
@@ -182,6 +203,8 @@ def setup_logging(log_level=None, log_file=None):
         log_file: Path to log file (None = stdout, recommended for systemd)
                   Priority: 1) parameter, 2) config.yaml, 3) None (stdout)
     """
+    global _queue_listener
+
     # Determine log level (parameter > env var > config > default)
     if log_level is None:
         log_level = os.getenv('LOG_LEVEL')
@@ -222,8 +245,24 @@ def setup_logging(log_level=None, log_file=None):
     # Add category filter
     handler.addFilter(CategoryFilter())
 
-    # Configure root logger
+    # Logging threads only enqueue records; a background listener thread does
+    # the formatting and the write to the file/stdout (SD card I/O)
+    log_queue = queue.SimpleQueue()
+    new_listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    new_listener.start()
+
+    # Configure root logger: attach the new queue before detaching the old
+    # handlers so no record is logged with nothing (or a dead queue) behind it
     root_logger = logging.getLogger()
     root_logger.setLevel(numeric_level)
-    root_logger.handlers.clear()  # Remove any existing handlers
-    root_logger.addHandler(handler)
+    old_handlers = list(root_logger.handlers)
+    root_logger.addHandler(QueueHandler(log_queue))
+    for old_handler in old_handlers:
+        root_logger.removeHandler(old_handler)  # Remove any existing handlers
+        if isinstance(old_handler, QueueHandler):
+            # Threads already inside the old handler enqueue onto the new queue
+            old_handler.queue = log_queue
+
+    # Old listener drains what was already queued to it, then stops
+    _stop_queue_listener()
+    _queue_listener = new_listener
@@ -28,10 +28,17 @@ logger = logging.getLogger(__name__)
 app = Flask(__name__)
 app.config['SECRET_KEY'] = config.SECRET_KEY
 
+# jsonify() and request.get_json() go through orjson when it is installed
+from server.helpers import OrjsonProvider
+app.json = OrjsonProvider(app)
+
 # Import and register routes
-from server.routes import register_routes
+from server.routes import register_routes, health_check_middleware
 register_routes(app)
 
+# Answer health check pings before Flask dispatch
+app.wsgi_app = health_check_middleware(app.wsgi_app)
+
 # Start config file watcher (auto-reload on config changes)
 from lib.config_watcher import start_watcher
 start_watcher(app)
@@ -6,14 +6,18 @@ Provides natural language command processing via OpenAI
 
 import logging
 import traceback
-from flask import Blueprint, request, jsonify
-from server.helpers import require_auth
+from flask import Blueprint, Response, request, jsonify
+from server.helpers import require_auth, json_bytes
+from server import ai_handler
 
 logger = logging.getLogger(__name__)
 
 # Create blueprint
 ai_bp = Blueprint('ai', __name__)
 
+# Constant error body, serialized once
+_COMMAND_REQUIRED_BYTES = json_bytes({'error': 'Command text required'})
+
 
 @ai_bp.route('/ai-command', methods=['POST'])
 @require_auth
@@ -41,11 +45,10 @@ def ai_command():
     dry_run = data.get('dry_run', False)
 
     if not command:
-        return jsonify({'error': 'Command text required'}), 400
+        return Response(_COMMAND_REQUIRED_BYTES, status=400, mimetype='application/json')
 
     try:
-        from server.ai_handler import process_command
-        result = process_command(command, dry_run=dry_run)
+        result = ai_handler.process_command(command, dry_run=dry_run)
 
         if result['status'] == 'error':
             return jsonify(result), 400
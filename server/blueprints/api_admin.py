@@ -10,6 +10,7 @@ Provides system administration endpoints:
 import os
 import subprocess
 import logging
+import platform
 from flask import Blueprint, request, jsonify
 from lib.logging_config import kvlog
 
@@ -18,6 +19,38 @@ logger = logging.getLogger(__name__)
 # Create blueprint
 api_admin_bp = Blueprint('api_admin', __name__)
 
+# Platform never changes while the process is running
+_PLATFORM = platform.system()
+
+# Repository checkout updated by /api/git-pull
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _git(*args, timeout=15):
+    """Run a git command in the repository, capturing text output"""
+    return subprocess.run(
+        ['git', *args],
+        cwd=_REPO_ROOT,
+        capture_output=True,
+        text=True,
+        timeout=timeout
+    )
+
+
+def _repo_up_to_date():
+    """
+    True if HEAD already matches its upstream branch
+
+    Runs a quiet `git fetch` and compares `rev-parse HEAD` with `@{u}` on
+    every call, so a commit pushed moments ago is always seen. Any git
+    failure returns False so the caller falls through to a real pull.
+    """
+    if _git('fetch', '--quiet').returncode != 0:
+        return False
+    local = _git('rev-parse', 'HEAD')
+    remote = _git('rev-parse', '@{u}')
+    return not (local.returncode or remote.returncode or local.stdout.strip() != remote.stdout.strip())
+
 
 @api_admin_bp.route('/api/shutdown', methods=['POST'])
 def api_shutdown():
@@ -34,8 +67,7 @@ def api_shutdown():
 
     try:
         # Trigger shutdown in background (gives us time to return response)
-        import platform
-        if platform.system() == 'Linux':
+        if _PLATFORM == 'Linux':
             subprocess.Popen(['sudo', 'shutdown', '-h', 'now'])
             return jsonify({
                 'status': 'shutdown_initiated',
@@ -46,7 +78,7 @@ def api_shutdown():
             return jsonify({
                 'status': 'not_supported',
                 'message': 'Shutdown only supported on Linux/Raspberry Pi',
-                'platform': platform.system()
+                'platform': _PLATFORM
             }), 400
 
     except Exception as e:
@@ -73,17 +105,18 @@ def api_git_pull():
     kvlog(logger, logging.WARNING, event='git_pull_requested', user='api', source=request.remote_addr, restart_after=restart_after)
 
     try:
-        import platform
-        repo_dir = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+        # Nothing to pull: skip the pull (and the pointless restart)
+        if _repo_up_to_date():
+            kvlog(logger, logging.INFO, event='git_pull_skipped', reason='up_to_date')
+            return jsonify({
+                'status': 'success',
+                'message': 'Already up to date',
+                'changed': False,
+                'restarting': False
+            }), 200
 
         # Run git pull
-        result = subprocess.run(
-            ['git', 'pull'],
-            cwd=repo_dir,
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
+        result = _git('pull', timeout=30)
 
         if result.returncode == 0:
             kvlog(logger, logging.NOTICE, event='git_pull_success', output=result.stdout.strip())
@@ -92,11 +125,12 @@ def api_git_pull():
                 'status': 'success',
                 'message': 'Git pull completed successfully',
                 'output': result.stdout.strip(),
+                'changed': True,
                 'restarting': restart_after
             }
 
             # Optionally restart service after pull
-            if restart_after and platform.system() == 'Linux':
+            if restart_after and _PLATFORM == 'Linux':
                 subprocess.Popen(['sudo', 'systemctl', 'restart', 'py_home'])
                 response['message'] += '. Flask restarting...'
 
@@ -109,9 +143,9 @@ def api_git_pull():
                 'error': result.stderr.strip()
             }), 500
 
-    except subprocess.TimeoutExpired:
-        kvlog(logger, logging.ERROR, event='git_pull_timeout')
-        return jsonify({'error': 'Git pull timed out after 30s'}), 504
+    except subprocess.TimeoutExpired as e:
+        kvlog(logger, logging.ERROR, event='git_pull_timeout', command=' '.join(e.cmd))
+        return jsonify({'error': f"{' '.join(e.cmd)} timed out after {e.timeout}s"}), 504
     except Exception as e:
         kvlog(logger, logging.ERROR, event='git_pull_failed', error_type=type(e).__name__, error_msg=str(e))
         return jsonify({'error': str(e)}), 500
@@ -137,8 +171,7 @@ def api_service_control():
     kvlog(logger, logging.WARNING, event='service_control_requested', action=action, user='api', source=request.remote_addr)
 
     try:
-        import platform
-        if platform.system() == 'Linux':
+        if _PLATFORM == 'Linux':
             # Trigger service control in background (gives us time to return response)
             subprocess.Popen(['sudo', 'systemctl', action, 'py_home'])
 
@@ -152,7 +185,7 @@ def api_service_control():
             return jsonify({
                 'status': 'not_supported',
                 'message': 'Service control only supported on Linux',
-                'platform': platform.system()
+                'platform': _PLATFORM
             }), 400
 
     except Exception as e:
@@ -6,64 +6,115 @@ Provides JSON APIs for querying status of smart home devices:
 - Sensibo AC
 - Tapo smart outlets
 - TempStick temperature sensors
+
+Clients are the shared per-component singletons (get_nest() etc.), so OAuth
+tokens and connections carry over between polls. Vendor calls run on the
+upstream pool with a hard timeout (call_upstream), so a slow vendor gets a
+504, or the last good body via cached_body, instead of a hung thread.
+
+Each status is produced by a plain function returning (status_code, JSON
+body) so /api/dashboard-status can call it without going through the view.
 """
 
 import logging
-from flask import Blueprint, jsonify
+from flask import Blueprint
+from server.helpers import json_bytes, cached_body, cached_body_response, call_upstream
 
 logger = logging.getLogger(__name__)
 
+# Server-side cache lifetimes (seconds), matched to how fast each device changes
+# and how slow its vendor API is
+NEST_CACHE_TTL = 15
+SENSIBO_CACHE_TTL = 15
+TAPO_CACHE_TTL = 30
+TEMPSTICK_CACHE_TTL = 60
+
+# Tapo polls every outlet in turn, so it gets longer than UPSTREAM_TIMEOUT
+TAPO_TIMEOUT = 25
+
 # Create blueprint
 api_device_bp = Blueprint('api_device', __name__)
 
 
+@cached_body('/api/nest/status', NEST_CACHE_TTL)
+def nest_status():
+    """Nest thermostat status: (status_code, JSON body)"""
+    try:
+        from components.nest import get_nest
+        status = call_upstream(get_nest().get_status)
+        return 200, json_bytes(status)
+    except TimeoutError as e:
+        logger.warning(f"Nest status timed out: {e}")
+        return 504, json_bytes({'error': str(e)})
+    except Exception as e:
+        logger.error(f"Failed to get Nest status: {e}")
+        return 500, json_bytes({'error': str(e)})
+
+
 @api_device_bp.route('/api/nest/status')
 def api_nest_status():
     """Get Nest thermostat status (JSON API for dashboard)"""
+    return cached_body_response(*nest_status())
+
+
+@cached_body('/api/sensibo/status', SENSIBO_CACHE_TTL)
+def sensibo_status():
+    """Sensibo AC status: (status_code, JSON body)"""
     try:
-        from components.nest import NestAPI
-        nest = NestAPI(dry_run=False)
-        status = nest.get_status()
-        return jsonify(status), 200
+        from components.sensibo import get_sensibo
+        status = call_upstream(get_sensibo().get_status)
+        return 200, json_bytes(status)
+    except TimeoutError as e:
+        logger.warning(f"Sensibo status timed out: {e}")
+        return 504, json_bytes({'error': str(e)})
     except Exception as e:
-        logger.error(f"Failed to get Nest status: {e}")
-        return jsonify({'error': str(e)}), 500
+        logger.error(f"Failed to get Sensibo status: {e}")
+        return 500, json_bytes({'error': str(e)})
 
 
 @api_device_bp.route('/api/sensibo/status')
 def api_sensibo_status():
     """Get Sensibo AC status (JSON API for dashboard)"""
+    return cached_body_response(*sensibo_status())
+
+
+@cached_body('/api/tapo/status', TAPO_CACHE_TTL)
+def tapo_status():
+    """Tapo smart outlets status: (status_code, JSON body)"""
     try:
-        from components.sensibo import SensiboAPI
-        sensibo = SensiboAPI(dry_run=False)
-        status = sensibo.get_status()
-        return jsonify(status), 200
+        from components.tapo import get_tapo
+        devices = call_upstream(get_tapo().get_all_status, TAPO_TIMEOUT)
+        return 200, json_bytes({'devices': devices})
+    except TimeoutError as e:
+        logger.warning(f"Tapo status timed out: {e}")
+        return 504, json_bytes({'error': str(e)})
     except Exception as e:
-        logger.error(f"Failed to get Sensibo status: {e}")
-        return jsonify({'error': str(e)}), 500
+        logger.error(f"Failed to get Tapo status: {e}")
+        return 500, json_bytes({'error': str(e)})
 
 
 @api_device_bp.route('/api/tapo/status')
 def api_tapo_status():
     """Get Tapo smart outlets status (JSON API for dashboard)"""
+    return cached_body_response(*tapo_status())
+
+
+@cached_body('/api/tempstick/status', TEMPSTICK_CACHE_TTL)
+def tempstick_status():
+    """TempStick sensor status: (status_code, JSON body)"""
     try:
-        from components.tapo import TapoAPI
-        tapo = TapoAPI(dry_run=False)
-        devices = tapo.get_all_status()
-        return jsonify({'devices': devices}), 200
+        from services.tempstick import get_tempstick
+        status = call_upstream(get_tempstick().get_sensor_data)
+        return 200, json_bytes(status)
+    except TimeoutError as e:
+        logger.warning(f"TempStick status timed out: {e}")
+        return 504, json_bytes({'error': str(e)})
     except Exception as e:
-        logger.error(f"Failed to get Tapo status: {e}")
-        return jsonify({'error': str(e)}), 500
+        logger.error(f"Failed to get TempStick status: {e}")
+        return 500, json_bytes({'error': str(e)})
 
 
 @api_device_bp.route('/api/tempstick/status')
 def api_tempstick_status():
     """Get TempStick sensor status (JSON API for dashboard)"""
-    try:
-        from services.tempstick import TempStickAPI
-        tempstick = TempStickAPI()
-        status = tempstick.get_sensor_data()
-        return jsonify(status), 200
-    except Exception as e:
-        logger.error(f"Failed to get TempStick status: {e}")
-        return jsonify({'error': str(e)}), 500
+    return cached_body_response(*tempstick_status())
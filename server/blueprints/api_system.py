@@ -6,13 +6,19 @@ Provides endpoints for system health, uptime, and monitoring:
 - Presence status
 - System status (uptime, health)
 - Automation control (enable/disable master switch)
+- Response cache statistics
 """
 
 import os
 import time
 import logging
+import platform
+from datetime import datetime
 from flask import Blueprint, request, jsonify
-from server import config
+from server import config, FLASK_START_TIME
+from server.helpers import json_bytes, json_response, json_body_response, response_cache_stats, STATUS_MAX_AGE
+from lib.config import get
+from lib.hvac_logic import is_sleep_time_cached
 from lib.logging_config import kvlog
 
 logger = logging.getLogger(__name__)
@@ -20,14 +26,67 @@ logger = logging.getLogger(__name__)
 # Create blueprint
 api_system_bp = Blueprint('api_system', __name__)
 
+# Platform never changes while the process is running
+_PLATFORM = platform.system()
+
+# Paths are fixed; resolve once instead of per request
+_REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+# Presence state file written by the arrival/departure automations
+_PRESENCE_STATE_FILE = os.path.join(_REPO_ROOT, '.presence_state')
+
+# Seconds a presence file stat result is reused across dashboard polls
+PRESENCE_CHECK_TTL = 2.0
+
+# Last presence file stat: (checked_at, mtime or None if missing)
+_presence_check = (0.0, None)
+
+# Last presence file contents: (mtime, state)
+_presence_state = (None, None)
+
+
+def _presence_mtime():
+    """
+    Modification time of the presence state file, or None if it is missing
+
+    Bursts of dashboard polls share one stat() per PRESENCE_CHECK_TTL.
+    """
+    global _presence_check
+    now = time.monotonic()
+    checked_at, mtime = _presence_check
+    if now - checked_at < PRESENCE_CHECK_TTL:
+        return mtime
+
+    try:
+        mtime = os.stat(_PRESENCE_STATE_FILE).st_mtime
+    except FileNotFoundError:
+        mtime = None
+    _presence_check = (now, mtime)
+    return mtime
+
+
+def _read_presence_state(mtime):
+    """
+    Presence state ('home'/'away'/...) from the state file
+
+    The file is only re-read when its mtime changes. Raises
+    FileNotFoundError if it was removed since `mtime` was taken.
+    """
+    global _presence_state
+    cached_mtime, state = _presence_state
+    if cached_mtime == mtime:
+        return state
+
+    with open(_PRESENCE_STATE_FILE, 'r') as f:
+        state = f.read().strip().lower()
+    _presence_state = (mtime, state)
+    return state
+
 
 @api_system_bp.route('/api/night-mode')
 def api_night_mode():
     """Get sleep time status (DEPRECATED - use /api/system-status)"""
     try:
-        from lib.hvac_logic import is_sleep_time
-        from server import FLASK_START_TIME
-
         # Calculate Flask uptime (not Pi uptime)
         uptime_seconds = time.time() - FLASK_START_TIME
         days = int(uptime_seconds // 86400)
@@ -39,61 +98,64 @@ def api_night_mode():
             uptime = f"{hours}h"
 
         # Return sleep_time status (replaces old night_mode flag)
-        return jsonify({
-            'night_mode': is_sleep_time(),  # Keep key name for backward compatibility
-            'sleep_time': is_sleep_time(),  # New name for clarity
+        sleep_time = is_sleep_time_cached()
+        return json_response({
+            'night_mode': sleep_time,  # Keep key name for backward compatibility
+            'sleep_time': sleep_time,  # New name for clarity
             'uptime': uptime
-        }), 200
+        }, 200, max_age=STATUS_MAX_AGE)
     except Exception as e:
         logger.error(f"Failed to get sleep time status: {e}")
-        return jsonify({'error': str(e)}), 500
+        return json_response({'error': str(e)}, 500)
 
 
-@api_system_bp.route('/api/presence')
-def api_presence():
-    """Get current presence status from .presence_state file"""
+def presence_status():
+    """Presence status from the .presence_state file: (status_code, JSON body)"""
     try:
-        state_file = os.path.join(os.path.dirname(__file__), '..', '..', '.presence_state')
+        mtime = _presence_mtime()
+
+        if mtime is not None:
+            try:
+                state = _read_presence_state(mtime)
+            except FileNotFoundError:
+                # Removed since the cached stat
+                mtime = None
 
-        if not os.path.exists(state_file):
-            return jsonify({
+        if mtime is None:
+            return 200, json_bytes({
                 'is_home': None,
                 'state': 'unknown',
                 'source': 'unknown',
                 'last_updated': None,
                 'age_seconds': None
-            }), 200
+            })
 
-        # Read state
-        with open(state_file, 'r') as f:
-            state = f.read().strip().lower()
-
-        # Get file modification time
-        mtime = os.path.getmtime(state_file)
-        from datetime import datetime
         age_seconds = time.time() - mtime
         last_updated = datetime.fromtimestamp(mtime).isoformat()
 
-        return jsonify({
+        return 200, json_bytes({
             'is_home': state == 'home',
             'state': state,
             'source': 'legacy',  # Deprecated: was presence_monitor, now using iOS geofencing
             'last_updated': last_updated,
             'age_seconds': round(age_seconds, 1)
-        }), 200
+        })
 
     except Exception as e:
         logger.error(f"Failed to get presence status: {e}")
-        return jsonify({'error': str(e)}), 500
+        return 500, json_bytes({'error': str(e)})
 
 
-@api_system_bp.route('/api/system-status')
-def api_system_status():
-    """Get comprehensive system status with Flask uptime"""
-    try:
-        from server import FLASK_START_TIME
-        import platform
+@api_system_bp.route('/api/presence')
+def api_presence():
+    """Get current presence status from .presence_state file"""
+    status, body = presence_status()
+    return json_body_response(body, status)
+
 
+def system_status():
+    """System status with Flask uptime: (status_code, JSON body)"""
+    try:
         # Calculate Flask uptime
         uptime_seconds = time.time() - FLASK_START_TIME
         days = int(uptime_seconds // 86400)
@@ -108,8 +170,7 @@ def api_system_status():
             uptime = f"{minutes}m"
 
         # Get sleep time status (replaces old night_mode flag system)
-        from lib.hvac_logic import is_sleep_time
-        night_mode = is_sleep_time()  # Variable name kept for backward compatibility
+        night_mode = is_sleep_time_cached()  # Variable name kept for backward compatibility
 
         # Check system health
         health_status = 'operational'
@@ -119,29 +180,33 @@ def api_system_status():
         # iOS geofencing via /update-location is now used for presence detection
 
         # Check dry-run mode
-        from lib.config import get
         dry_run = get('automations.dry_run', False)
 
-        return jsonify({
+        return 200, json_bytes({
             'status': health_status,
             'flask_uptime': uptime,
             'flask_uptime_seconds': int(uptime_seconds),
             'night_mode': night_mode,
             'dry_run': dry_run,
             'services': services,
-            'platform': platform.system()
-        }), 200
+            'platform': _PLATFORM
+        })
 
     except Exception as e:
         logger.error(f"Failed to get system status: {e}")
-        return jsonify({'error': str(e)}), 500
+        return 500, json_bytes({'error': str(e)})
+
+
+@api_system_bp.route('/api/system-status')
+def api_system_status():
+    """Get comprehensive system status with Flask uptime"""
+    status, body = system_status()
+    return json_body_response(body, status)
 
 
 @api_system_bp.route('/api/automation-control', methods=['GET', 'POST'])
 def api_automation_control():
     """Get/set dry-run mode for automations"""
-    from lib.config import get
-
     if request.method == 'GET':
         # Get current dry-run status
         dry_run = get('automations.dry_run', False)
@@ -159,3 +224,9 @@ def api_automation_control():
             'message': 'Edit config/config.yaml and set automations.dry_run, then restart service',
             'current_dry_run': get('automations.dry_run', False)
         }), 403
+
+
+@api_system_bp.route('/api/cache-stats')
+def api_cache_stats():
+    """Get device status response cache hit/miss counters"""
+    return json_response(response_cache_stats(), 200)
@@ -6,16 +6,34 @@ Provides endpoints for iOS Shortcuts geofencing integration:
 - Get current location and ETA
 """
 
+import time
 import logging
+import threading
 import traceback
-from flask import Blueprint, request, jsonify
-from server.helpers import require_auth, run_automation_script
+from flask import Blueprint, request
+from server.helpers import require_auth, run_automation_script, json_response
+from lib import location as location_lib
 
 logger = logging.getLogger(__name__)
 
 # Create blueprint
 location_bp = Blueprint('location', __name__)
 
+# Repeats of the same geofence trigger within this window reuse the previous
+# outcome (GPS jitter can fire "near_home" several times a minute)
+TRIGGER_DEBOUNCE_SECONDS = 60
+
+# Last launched automation per trigger: {trigger: (monotonic timestamp, result fields)}
+_LAST_TRIGGER = {}
+_LAST_TRIGGER_LOCK = threading.Lock()
+
+
+def _release_trigger(trigger, claim):
+    """Drop a debounce claim that did not launch anything (unless already replaced)"""
+    with _LAST_TRIGGER_LOCK:
+        if _LAST_TRIGGER.get(trigger) is claim:
+            del _LAST_TRIGGER[trigger]
+
 
 @location_bp.route('/update-location', methods=['POST'])
 @require_auth
@@ -44,21 +62,36 @@ def update_location():
     trigger_automations = data.get('trigger_automations', True)
 
     if lat is None or lng is None:
-        return jsonify({'error': 'lat and lng required'}), 400
+        return json_response({'error': 'lat and lng required'}, 400)
 
+    claim = None
     try:
-        from lib.location import update_location as update_loc
-        from lib.location import should_trigger_arrival, get_eta_home
-
         # Update location
-        result = update_loc(lat, lng, trigger)
+        result = location_lib.update_location(lat, lng, trigger)
 
         # Check if we should trigger arrival automations
         if trigger_automations:
-            should_trigger, automation_type = should_trigger_arrival(trigger)
+            now = time.monotonic()
+            with _LAST_TRIGGER_LOCK:
+                last = _LAST_TRIGGER.get(trigger)
+                if not last or now - last[0] >= TRIGGER_DEBOUNCE_SECONDS:
+                    # Claim the trigger before the slow ETA lookup so a
+                    # concurrent duplicate is debounced instead of launching too
+                    last = None
+                    claim = (now, {'automation_triggered': None})
+                    _LAST_TRIGGER[trigger] = claim
+
+            if last:
+                # Duplicate trigger: skip ETA lookup and automation launch
+                logger.info(f"Debounced duplicate '{trigger}' trigger")
+                result.update(last[1])
+                result['message'] = 'debounced'
+                return json_response(result, 200)
+
+            should_trigger, automation_type = location_lib.should_trigger_arrival(trigger)
 
             if should_trigger:
-                eta = get_eta_home()
+                eta = location_lib.get_eta_home()
 
                 # Add ETA to result
                 result['eta'] = eta
@@ -84,22 +117,32 @@ def update_location():
                     run_automation_script('im_home.py')
                     result['automation_triggered'] = 'full_arrival'
                     result['message'] = "Welcome home! Running arrival automation."
+
+                # Remember outcome so repeats of this trigger are debounced
+                with _LAST_TRIGGER_LOCK:
+                    _LAST_TRIGGER[trigger] = (now, {
+                        'eta': eta,
+                        'automation_triggered': result.get('automation_triggered')
+                    })
             else:
+                _release_trigger(trigger, claim)
                 result['automation_triggered'] = None
                 result['message'] = f"Location updated ({result['distance_from_home_meters']:.0f}m from home)"
         else:
             result['automation_triggered'] = None
             result['message'] = "Location updated (automations disabled)"
 
-        return jsonify(result), 200
+        return json_response(result, 200)
 
     except Exception as e:
+        if claim:
+            _release_trigger(trigger, claim)
         logger.error(f"Failed to update location: {e}")
         traceback.print_exc()
-        return jsonify({
+        return json_response({
             'status': 'error',
             'message': f'Failed to update location: {str(e)}'
-        }), 500
+        }, 500)
 
 
 @location_bp.route('/location', methods=['GET'])
@@ -108,31 +151,32 @@ def get_location():
     """
     Get user's last known location and ETA home
 
+    Query params:
+        fresh: If 1, bypass the short-lived ETA cache (manual refresh)
+
     Returns:
         JSON with location data and ETA (if available)
     """
     logger.info("Received /location request")
 
     try:
-        from lib.location import get_location as get_loc, get_eta_home
-
-        location = get_loc()
+        location = location_lib.get_location()
         if not location:
-            return jsonify({
+            return json_response({
                 'status': 'no_data',
                 'message': 'No location data available'
-            }), 404
+            }, 404)
 
         # Add ETA if not home
         if not location['is_home']:
-            eta = get_eta_home()
+            eta = location_lib.get_eta_home(fresh=request.args.get('fresh') == '1')
             location['eta'] = eta
 
-        return jsonify(location), 200
+        return json_response(location, 200)
 
     except Exception as e:
         logger.error(f"Failed to get location: {e}")
-        return jsonify({
+        return json_response({
             'status': 'error',
             'message': f'Failed to get location: {str(e)}'
-        }), 500
+        }, 500)
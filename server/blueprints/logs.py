@@ -5,14 +5,364 @@ Provides web UI and API endpoints for browsing application logs
 """
 
 import os
+import re
+import gzip
+import time
+import hashlib
+import zlib
 import logging
-from flask import Blueprint, request, jsonify, render_template
+import itertools
+import threading
+from pathlib import Path
+from stat import S_ISREG
+from functools import lru_cache
+from operator import itemgetter
+from flask import Blueprint, Response, request, send_file
+from server.helpers import json_bytes, json_response, json_body_response, static_page_response
 
 logger = logging.getLogger(__name__)
 
 # Create blueprint
 logs_bp = Blueprint('logs', __name__)
 
+# Log directory (<repo>/data/logs), resolved once so traversal checks are a path compare
+LOGS_DIR = (Path(__file__).resolve().parents[2] / 'data' / 'logs').resolve()
+
+# Block size for reading log files (tail scans backwards from EOF in these steps)
+READ_CHUNK_SIZE = 64 * 1024
+
+# Read buffer for head mode, which iterates the file line by line
+HEAD_BUFFER_SIZE = 1 << 20
+
+# JSON responses hold the whole window in memory; use format=text for more
+MAX_JSON_LINES = 1000
+
+# Bodies smaller than this are not worth gzipping
+GZIP_MIN_SIZE = 1024
+
+# Upper bound on files polled by one /logs/batch request
+MAX_BATCH_FILES = 20
+
+# Directory listing is reused for this long (seconds) to absorb bursts of polls
+LIST_CACHE_TTL = 1.0
+_list_cache = {'ts': 0.0, 'body': None, 'etag': None, 'mtime': 0}
+_list_cache_lock = threading.Lock()
+
+# _resolve_log() error bodies, serialized once (unknown names are what scanners hit)
+_RESOLVE_ERROR_BYTES = {
+    message: json_bytes({'error': message}) for message in ('Invalid filename', 'Log file not found')
+}
+
+
+def _tail_offset(f, lines, size=None):
+    """
+    Find where the last N lines of a file start, reading backwards from EOF
+
+    Args:
+        f: File opened in binary mode
+        lines: Number of lines wanted
+        size: Treat this offset as EOF (default: current end of file)
+
+    Returns:
+        int: Byte offset of the first of the last `lines` lines
+    """
+    if size is None:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+    if size == 0 or lines <= 0:
+        return size
+
+    # A trailing newline terminates the last line rather than starting a new one
+    f.seek(size - 1)
+    remaining = lines + 1 if f.read(1) == b'\n' else lines
+
+    pos = size
+    while pos > 0:
+        read_size = min(READ_CHUNK_SIZE, pos)
+        pos -= read_size
+        f.seek(pos)
+        chunk = f.read(read_size)
+
+        count = chunk.count(b'\n')
+        if count < remaining:
+            remaining -= count
+            continue
+
+        # Target newline is in this chunk: everything before it is the
+        # first piece of a right split (one C call instead of N rfinds)
+        return pos + len(chunk.rsplit(b'\n', remaining)[0]) + 1
+
+    return 0
+
+
+def _not_modified(etag, last_modified=None):
+    """
+    Return a 304 response if the client's cached copy is current, else None
+
+    If-None-Match takes precedence; If-Modified-Since (1 s resolution) is only
+    checked when the client sent no ETag.
+    """
+    if request.if_none_match:
+        fresh = request.if_none_match.contains_weak(etag)
+    else:
+        ims = request.if_modified_since
+        fresh = bool(ims and last_modified and int(last_modified) <= ims.timestamp())
+
+    if fresh:
+        return _with_etag(Response(status=304), etag, last_modified)
+    return None
+
+
+def _with_etag(response, etag, last_modified=None):
+    """Attach a weak ETag (and Last-Modified); no-cache makes browsers revalidate on every poll"""
+    response.set_etag(etag, weak=True)
+    if last_modified:
+        response.last_modified = last_modified
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+def _gzip_stream(chunks):
+    """gzip-compress a stream of byte chunks on the fly"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31: gzip container
+    try:
+        for chunk in chunks:
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+        yield compressor.flush()
+    finally:
+        if hasattr(chunks, 'close'):
+            chunks.close()
+
+
+def _compress(response, size=None):
+    """
+    gzip the response body if the client accepts it and it is large enough
+
+    Args:
+        response: Response with a byte body or a streamed chunk iterator
+        size: Expected body size for streamed responses (upper bound is fine)
+    """
+    if 'gzip' not in request.accept_encodings:
+        return response
+    if not response.is_streamed:
+        size = len(response.get_data())
+    if not size or size < GZIP_MIN_SIZE:
+        return response
+
+    if response.is_streamed:
+        response.response = _gzip_stream(response.response)
+    else:
+        response.set_data(gzip.compress(response.get_data(), 6))
+    response.headers['Content-Encoding'] = 'gzip'
+    response.vary.add('Accept-Encoding')
+    return response
+
+
+def _iter_blocks(f, offset, end=None):
+    """Yield file contents from offset to end (default: EOF) in blocks, closing the file when done"""
+    try:
+        f.seek(offset)
+        remaining = None if end is None else end - offset
+        while True:
+            read_size = READ_CHUNK_SIZE if remaining is None else min(READ_CHUNK_SIZE, remaining)
+            block = f.read(read_size)
+            if not block:
+                break
+            if remaining is not None:
+                remaining -= len(block)
+            yield block
+    finally:
+        f.close()
+
+
+@lru_cache(maxsize=256)
+def _cached_tail_offset(path, mtime_ns, size, lines):
+    """_tail_offset memoized per file state; any write changes mtime/size and so the key"""
+    with open(path, 'rb') as f:
+        return _tail_offset(f, lines, size)
+
+
+def _read_tail(filepath, lines, stat=None):
+    """Iterator over the last N lines of a file (memory bounded by one block)"""
+    if stat is None:
+        stat = os.stat(filepath)
+    offset = _cached_tail_offset(str(filepath), stat.st_mtime_ns, stat.st_size, lines)
+    return _iter_blocks(open(filepath, 'rb'), offset, stat.st_size)
+
+
+@lru_cache(maxsize=32)
+def _cached_reversed_tail(path, mtime_ns, size, lines):
+    """Last N lines joined newest first; memoized per file state since the dashboard re-polls an unchanged log"""
+    with open(path, 'rb') as f:
+        offset = _tail_offset(f, lines, size)
+        f.seek(offset)
+        rows = f.read(size - offset).splitlines()
+    rows.reverse()
+    return b'\n'.join(rows)
+
+
+def _read_range(filepath, start, end):
+    """Iterator over bytes [start, end) of a file"""
+    return _iter_blocks(open(filepath, 'rb'), start, end)
+
+
+def _read_head(filepath, lines):
+    """Iterator over the first N lines of a file, grouped into ~READ_CHUNK_SIZE blocks"""
+    # Large buffer: line iteration would otherwise refill 8 KB at a time
+    f = open(filepath, 'rb', buffering=HEAD_BUFFER_SIZE)
+
+    def lines_then_close():
+        try:
+            block, block_size = [], 0
+            for line in itertools.islice(f, lines):
+                block.append(line)
+                block_size += len(line)
+                if block_size >= READ_CHUNK_SIZE:
+                    yield b''.join(block)
+                    block, block_size = [], 0
+            if block:
+                yield b''.join(block)
+        finally:
+            f.close()
+
+    return lines_then_close()
+
+
+def _scan_logs(logs_dir):
+    """
+    Collect metadata for every regular file in the log directory
+
+    Returns:
+        list: [{name, size_bytes, modified, url}], or None if the directory is missing
+    """
+    # scandir yields cached type/stat info from the directory read itself
+    log_files = []
+    try:
+        with os.scandir(logs_dir) as entries:
+            for entry in entries:
+                if not entry.is_file(follow_symlinks=False):
+                    continue
+                stat = entry.stat()
+                log_files.append({
+                    'name': entry.name,
+                    'size_bytes': stat.st_size,
+                    'modified': stat.st_mtime,
+                    'url': f'/logs/{entry.name}'
+                })
+    except FileNotFoundError:
+        return None
+    return log_files
+
+
+def _line_filter(args):
+    """
+    Build a line predicate from the level/automation/grep query params
+
+    Matches the log viewer's own filters: level is the padded column after
+    the timestamp, automation a fragment of the automation=<name> field,
+    grep a case-insensitive substring (checked first: cheapest and usually
+    the most selective).
+
+    Returns:
+        callable or None: keep(line) -> bool, or None if no filter is set
+    """
+    checks = []
+    grep = args.get('grep', '').strip().lower()
+    if grep:
+        checks.append(lambda line: grep in line.lower())
+    level = args.get('level', '').strip()
+    if level:
+        checks.append(re.compile(r'\s%s\s' % re.escape(level)).search)
+    automation = args.get('automation', '').strip()
+    if automation:
+        checks.append(re.compile(r'automation=\S*%s' % re.escape(automation), re.IGNORECASE).search)
+
+    if not checks:
+        return None
+    return lambda line: all(check(line) for check in checks)
+
+
+def _filter_lines(text, keep):
+    """
+    Lines of text for which keep(line) is true
+
+    An unterminated last line is always kept: a later ?since= read continues
+    it, so dropping it would glue the appended bytes onto the wrong line.
+    """
+    lines = text.split('\n')
+    tail = lines.pop()  # '' when text ends with a newline
+    return ''.join(line + '\n' for line in lines if keep(line)) + tail
+
+
+def _resolve_log(filename):
+    """
+    Validate a log filename and stat it
+
+    Returns:
+        tuple: (filepath, stat, None) or (None, None, (error_message, http_status))
+    """
+    try:
+        # Security: resolved path must sit directly in the log directory
+        filepath = (LOGS_DIR / filename).resolve()
+        if filepath.parent != LOGS_DIR:
+            return None, None, ('Invalid filename', 400)
+        stat = filepath.stat()
+    except FileNotFoundError:
+        return None, None, ('Log file not found', 404)
+    except (OSError, ValueError):
+        # Names the OS can't look up at all (too long, embedded NUL byte)
+        return None, None, ('Invalid filename', 400)
+    if not S_ISREG(stat.st_mode):
+        return None, None, ('Log file not found', 404)
+
+    return filepath, stat, None
+
+
+def _lines_param(default=100):
+    """?lines= as a non-negative int; None if it is not one (caller returns 400)"""
+    raw = request.args.get('lines')
+    if raw is None:
+        return default
+    try:
+        lines = int(raw)
+    except ValueError:
+        return None
+    return lines if lines >= 0 else None
+
+
+def _window_body(filename, tail_mode, window):
+    """JSON body for a window of log bytes (format=json responses)"""
+    content = window.decode('utf-8', errors='replace')
+    return json_bytes({
+        'status': 'success',
+        'filename': filename,
+        'lines_returned': len(content.splitlines()),
+        'tail_mode': tail_mode,
+        'content': content
+    })
+
+
+def reversed_tail(filename, lines):
+    """
+    Last N lines of a log, newest first: (status_code, JSON body)
+
+    Same body as /logs/<filename>?format=json&reverse=1, without the
+    conditional request and compression handling; the dashboard aggregate
+    calls this directly.
+    """
+    filepath, stat, error = _resolve_log(filename)
+    if error:
+        return error[1], _RESOLVE_ERROR_BYTES[error[0]]
+
+    try:
+        window = _cached_reversed_tail(str(filepath), stat.st_mtime_ns, stat.st_size, min(lines, MAX_JSON_LINES))
+        return 200, _window_body(filename, True, window)
+    except Exception as e:
+        logger.error(f"Failed to read log file {filename}: {e}")
+        return 500, json_bytes({'status': 'error', 'message': str(e)})
+
 
 @logs_bp.route('/logs')
 def logs_ui():
@@ -25,8 +375,8 @@ def logs_ui():
     if request.accept_mimetypes.best == 'application/json' or request.args.get('format') == 'json':
         return list_logs()
 
-    # Serve HTML UI
-    return render_template('logs.html')
+    # Serve HTML UI (rendered once, gzip + strong ETag)
+    return static_page_response('logs.html')
 
 
 def list_logs():
@@ -36,46 +386,109 @@ def list_logs():
     Returns:
         JSON with list of log files and their sizes/timestamps
     """
-    logger.info("Received /logs API request")
-
-    logs_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'logs')
+    # Debug only: polled every few seconds, and would otherwise fill the logs it lists
+    logger.debug("Received /logs API request")
 
     try:
-        if not os.path.exists(logs_dir):
-            return jsonify({
-                'status': 'no_logs',
-                'message': 'Log directory does not exist',
-                'logs': []
-            }), 200
-
-        log_files = []
-        for filename in os.listdir(logs_dir):
-            filepath = os.path.join(logs_dir, filename)
-            if os.path.isfile(filepath):
-                stat = os.stat(filepath)
-                log_files.append({
-                    'name': filename,
-                    'size_bytes': stat.st_size,
-                    'modified': stat.st_mtime,
-                    'url': f'/logs/{filename}'
+        # Concurrent polls wait on the lock and then share one scan
+        with _list_cache_lock:
+            if _list_cache['body'] is None or time.monotonic() - _list_cache['ts'] >= LIST_CACHE_TTL:
+                log_files = _scan_logs(LOGS_DIR)
+                if log_files is None:
+                    return json_response({
+                        'status': 'no_logs',
+                        'message': 'Log directory does not exist',
+                        'logs': []
+                    }, 200)
+
+                # Any write, new file or deletion changes the tag
+                newest = max((f['modified'] for f in log_files), default=0)
+                etag = '%x-%x-%x' % (
+                    len(log_files),
+                    int(newest * 1e6),
+                    sum(f['size_bytes'] for f in log_files)
+                )
+
+                # Sort by modified time, newest first
+                log_files.sort(key=itemgetter('modified'), reverse=True)
+
+                _list_cache['body'] = json_bytes({
+                    'status': 'success',
+                    'logs_directory': str(LOGS_DIR),
+                    'count': len(log_files),
+                    'logs': log_files
                 })
+                _list_cache['etag'] = etag
+                _list_cache['mtime'] = newest
+                _list_cache['ts'] = time.monotonic()
+
+            body, etag, newest = _list_cache['body'], _list_cache['etag'], _list_cache['mtime']
 
-        # Sort by modified time, newest first
-        log_files.sort(key=lambda x: x['modified'], reverse=True)
+        not_modified = _not_modified(etag, newest)
+        if not_modified:
+            return not_modified
 
-        return jsonify({
-            'status': 'success',
-            'logs_directory': logs_dir,
-            'count': len(log_files),
-            'logs': log_files
-        }), 200
+        return _with_etag(Response(body, mimetype='application/json'), etag, newest)
 
     except Exception as e:
         logger.error(f"Failed to list logs: {e}")
-        return jsonify({
+        return json_response({
             'status': 'error',
             'message': str(e)
-        }), 500
+        }, 500)
+
+
+@logs_bp.route('/logs/batch', methods=['GET'])
+def batch_logs():
+    """
+    Poll several log files in one request
+
+    Query params:
+        files: Comma-separated log filenames (max 20)
+        lines: Lines per file when returning a full window (default: 100, max: 1000)
+        since: Comma-separated byte offsets matching `files` (from a previous
+               `size`); an empty or out-of-range entry returns a full window
+
+    Returns:
+        JSON {'files': {name: {'content', 'size', 'incremental'}}}; per-file
+        failures are reported as {name: {'error'}} without failing the batch
+    """
+    filenames = [name for name in request.args.get('files', '').split(',') if name]
+    if not filenames:
+        return json_response({'error': 'No files requested'}, 400)
+    if len(filenames) > MAX_BATCH_FILES:
+        return json_response({'error': f'At most {MAX_BATCH_FILES} files per batch'}, 400)
+
+    lines_requested = _lines_param()
+    if lines_requested is None:
+        return json_response({'error': 'lines must be a non-negative integer'}, 400)
+    lines_requested = min(lines_requested, MAX_JSON_LINES)
+    offsets = request.args.get('since', '').split(',')
+
+    results = {}
+    for i, filename in enumerate(filenames):
+        filepath, stat, error = _resolve_log(filename)
+        if error:
+            results[filename] = {'error': error[0]}
+            continue
+
+        since = offsets[i] if i < len(offsets) else ''
+        incremental = since.isdigit() and int(since) <= stat.st_size
+        try:
+            if incremental:
+                chunks = _read_range(filepath, int(since), stat.st_size)
+            else:
+                chunks = _read_tail(filepath, lines_requested, stat)
+            results[filename] = {
+                'content': b''.join(chunks).decode('utf-8', errors='replace'),
+                'size': stat.st_size,
+                'incremental': incremental
+            }
+        except OSError as e:
+            logger.error(f"Failed to read log file {filename}: {e}")
+            results[filename] = {'error': str(e)}
+
+    return _compress(json_response({'status': 'success', 'files': results}))
 
 
 @logs_bp.route('/logs/<filename>', methods=['GET'])
@@ -84,55 +497,92 @@ def view_log(filename):
     View contents of a specific log file
 
     Query params:
-        lines: Number of lines to return (default: 100, max: 10000)
+        lines: Number of lines to return (default: 100, max: 10000; max 1000 for JSON)
         tail: If true, return last N lines; if false, return first N lines (default: true)
+        full: If true, return the whole file as plain text (supports Range requests)
+        since: Byte offset from a previous X-Log-Size header; returns only the
+               bytes appended since then (416 if the file has shrunk)
+        reverse: If true (tail mode only), return the lines newest first
+        level, automation, grep: Only return lines of the window matching
+               these filters (same rules as the log viewer); not combinable
+               with since or reverse
 
     Returns:
-        JSON with log contents or plain text if ?format=text
+        JSON with log contents or streamed plain text if ?format=text.
+        X-Log-Size header carries the file size the content was read up to.
     """
-    logger.info(f"Received /logs/{filename} request")
-
-    # Security: prevent directory traversal
-    if '..' in filename or '/' in filename or '\\' in filename:
-        return jsonify({'error': 'Invalid filename'}), 400
+    logger.debug("Received /logs/%s request", filename)
 
-    logs_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'logs')
-    filepath = os.path.join(logs_dir, filename)
+    filepath, stat, error = _resolve_log(filename)
+    if error:
+        return Response(_RESOLVE_ERROR_BYTES[error[0]], status=error[1], mimetype='application/json')
 
-    if not os.path.exists(filepath):
-        return jsonify({'error': 'Log file not found'}), 404
+    lines_requested = _lines_param()
+    if lines_requested is None:
+        return json_response({'error': 'lines must be a non-negative integer'}, 400)
 
     try:
-        lines_requested = min(int(request.args.get('lines', 100)), 10000)
+        lines_requested = min(lines_requested, 10000)
         tail_mode = request.args.get('tail', 'true').lower() == 'true'
+        reverse = tail_mode and request.args.get('reverse', '').lower() in ('1', 'true')
         format_type = request.args.get('format', 'json')
 
-        with open(filepath, 'r') as f:
-            if tail_mode:
-                # Read last N lines
-                all_lines = f.readlines()
-                lines = all_lines[-lines_requested:] if len(all_lines) > lines_requested else all_lines
-            else:
-                # Read first N lines
-                lines = [f.readline() for _ in range(lines_requested)]
+        # Whole-file download: let the WSGI server hand the file to the socket
+        # (sendfile under gunicorn); conditional=True adds ETag/Range handling
+        full_file = request.args.get('full', '').lower() == 'true'
+        if full_file or (format_type == 'text' and not tail_mode and lines_requested >= 10000):
+            return send_file(filepath, mimetype='text/plain', conditional=True)
+
+        if format_type != 'text':
+            lines_requested = min(lines_requested, MAX_JSON_LINES)
+
+        # Incremental tail: client already has everything before `since`
+        since = request.args.get('since', type=int)
+
+        keep = _line_filter(request.args)
+        if keep and (since is not None or reverse):
+            return json_response({'error': 'Line filters cannot be combined with since or reverse'}, 400)
+        if since is not None and not 0 <= since <= stat.st_size:
+            response = json_response({'error': 'Offset beyond end of file'}, 416)
+            response.headers['X-Log-Size'] = str(stat.st_size)
+            return response
 
-        content = ''.join(lines)
+        # Same file state + same query = same body
+        etag = '%x-%x-%d-%d-%d-%s-%s' % (stat.st_mtime_ns, stat.st_size, lines_requested, tail_mode, reverse,
+                                         format_type, since)
+        if keep:
+            etag += '-' + hashlib.blake2b(request.query_string, digest_size=6).hexdigest()
+        not_modified = _not_modified(etag, stat.st_mtime)
+        if not_modified:
+            return not_modified
+
+        if since is not None:
+            # Stop at the stat'ed size so X-Log-Size matches what was sent
+            chunks = _read_range(filepath, since, stat.st_size)
+        elif reverse:
+            chunks = [_cached_reversed_tail(str(filepath), stat.st_mtime_ns, stat.st_size, lines_requested)]
+        elif tail_mode:
+            chunks = _read_tail(filepath, lines_requested, stat)
+        else:
+            chunks = _read_head(filepath, lines_requested)
+
+        if keep:
+            # Filtering needs whole lines: decode the window once, drop non-matches
+            text = _filter_lines(b''.join(chunks).decode('utf-8', errors='replace'), keep)
+            chunks = [text.encode('utf-8')]
 
         if format_type == 'text':
-            from flask import Response
-            return Response(content, mimetype='text/plain')
+            # Stream so large windows start sending before the read finishes
+            response = Response(chunks, mimetype='text/plain')
         else:
-            return jsonify({
-                'status': 'success',
-                'filename': filename,
-                'lines_returned': len(lines),
-                'tail_mode': tail_mode,
-                'content': content
-            }), 200
+            response = json_body_response(_window_body(filename, tail_mode, b''.join(chunks)))
+
+        response.headers['X-Log-Size'] = str(stat.st_size)
+        return _with_etag(_compress(response, stat.st_size - (since or 0)), etag, stat.st_mtime)
 
     except Exception as e:
         logger.error(f"Failed to read log file {filename}: {e}")
-        return jsonify({
+        return json_response({
             'status': 'error',
             'message': str(e)
-        }), 500
+        }, 500)
@@ -11,20 +11,46 @@ Provides webhook endpoints that trigger home automation scripts:
 - Add task
 """
 
-import os
-import sys
-import subprocess
+import time
 import logging
-import json
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
 from flask import Blueprint, request, jsonify
-from server import config
 from server.helpers import require_auth, run_automation_script
+from automations.travel_time import run as get_travel_time
 
 logger = logging.getLogger(__name__)
 
 # Create blueprint
 webhooks_bp = Blueprint('webhooks', __name__)
 
+# Worker pool for synchronous automations that need a timeout
+_SYNC_POOL = ThreadPoolExecutor(max_workers=4)
+
+# Seconds a travel time result is reused per destination (one Google Maps call)
+TRAVEL_TIME_CACHE_TTL = 60
+
+# Most destinations kept at once (destination is free text from the client)
+TRAVEL_TIME_CACHE_SIZE = 32
+
+# Last successful lookup per destination, oldest first: {destination: (fetched_at, result)}
+_travel_time_cache = {}
+_travel_time_cache_lock = threading.Lock()
+
+
+def _cache_travel_time(destination, fetched_at, result):
+    """
+    Store a lookup, dropping expired entries and, beyond TRAVEL_TIME_CACHE_SIZE,
+    the oldest ones (caller holds _travel_time_cache_lock)
+    """
+    _travel_time_cache.pop(destination, None)
+    expired = [key for key, (ts, _) in _travel_time_cache.items() if fetched_at - ts >= TRAVEL_TIME_CACHE_TTL]
+    for key in expired:
+        del _travel_time_cache[key]
+    while len(_travel_time_cache) >= TRAVEL_TIME_CACHE_SIZE:
+        del _travel_time_cache[next(iter(_travel_time_cache))]
+    _travel_time_cache[destination] = (fetched_at, result)
+
 
 @webhooks_bp.route('/pre-arrival', methods=['POST'])
 @require_auth
@@ -92,28 +118,26 @@ def travel_time():
     else:
         destination = request.args.get('destination', 'Milwaukee, WI')
 
-    # Run script synchronously to get results
-    script_path = os.path.join(config.AUTOMATIONS_DIR, 'travel_time.py')
+    now = time.monotonic()
+    with _travel_time_cache_lock:
+        entry = _travel_time_cache.get(destination)
+    if entry and now - entry[0] < TRAVEL_TIME_CACHE_TTL:
+        return jsonify(entry[1]), 200
 
     try:
-        result = subprocess.run(
-            [sys.executable, script_path, destination],
-            capture_output=True,
-            text=True,
-            timeout=15
-        )
-
-        if result.returncode == 0:
-            # Parse JSON output from script
-            output = json.loads(result.stdout)
-            logger.info(f"Travel time to {destination}: {output.get('duration_in_traffic_minutes')} mins")
-            return jsonify(output), 200
-        else:
-            logger.error(f"Script failed: {result.stderr}")
-            return jsonify({'error': result.stderr}), 500
-
-    except subprocess.TimeoutExpired:
-        logger.error("Travel time script timed out")
+        # Run in-process with a timeout (avoids spawning a new interpreter)
+        future = _SYNC_POOL.submit(get_travel_time, destination)
+        output = future.result(timeout=15)
+
+        if 'error' not in output:
+            with _travel_time_cache_lock:
+                _cache_travel_time(destination, now, output)
+
+        logger.info(f"Travel time to {destination}: {output.get('duration_in_traffic_minutes')} mins")
+        return jsonify(output), 200
+
+    except FuturesTimeoutError:
+        logger.error("Travel time lookup timed out")
         return jsonify({'error': 'Request timed out'}), 504
     except Exception as e:
         logger.error(f"Failed to get travel time: {e}")
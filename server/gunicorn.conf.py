@@ -0,0 +1,33 @@
+"""
+Gunicorn configuration for py_home Flask server
+
+Production WSGI server settings (replaces the single-threaded Flask dev server).
+
+Usage:
+    gunicorn -c server/gunicorn.conf.py server.app:app
+
+Threaded workers let slow vendor calls (e.g. /api/tapo/status) overlap with
+other dashboard polls, and keep-alive reuses TCP connections between polls.
+"""
+
+import os
+
+# Bind address (same env vars as server/config.py)
+bind = f"{os.getenv('FLASK_HOST', '0.0.0.0')}:{os.getenv('FLASK_PORT', '5000')}"
+
+# One process by default: geofence debounce and response caches are per-process
+workers = int(os.getenv('GUNICORN_WORKERS', 1))
+worker_class = 'gthread'
+threads = int(os.getenv('GUNICORN_THREADS', 8))
+
+# Keep polling connections open between dashboard refreshes
+keepalive = 30
+timeout = 30
+
+# Import the app in each worker, not the master: the config watcher thread
+# started at import would not survive the fork
+preload_app = False
+
+# Logging goes through lib.logging_config; only send gunicorn errors to journal
+accesslog = None
+errorlog = '-'
@@ -1,36 +1,419 @@
 """
 Flask route helper functions
 
-Shared utilities for authentication and automation script execution.
+Shared utilities for authentication, JSON responses and automation script execution.
 """
 
 import os
 import sys
+import time
+import gzip
+import json
+import hmac
+import hashlib
 import subprocess
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
 from functools import wraps
-from flask import request, jsonify
+from flask import request, jsonify, Response, render_template, current_app, url_for
+from flask.json.provider import DefaultJSONProvider
 from server import config
 from lib.logging_config import kvlog
 
+try:
+    import orjson
+except ImportError:
+    # Fallback to stdlib json if orjson not installed
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    # Static pages are then offered as gzip only
+    brotli = None
+
 logger = logging.getLogger(__name__)
 
+# Browser cache lifetime (seconds) for polled status responses (dashboard polls every 5s)
+STATUS_MAX_AGE = 3
+
+
+def json_bytes(obj):
+    """Serialize obj to JSON bytes (orjson when available, else stdlib json)"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj).encode('utf-8')
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by orjson (jsonify, request.get_json)
+
+    Output matches the default provider: sorted keys, and dates passed
+    through to its `default` so they keep the HTTP date format. Falls back
+    to stdlib json when orjson is missing or formatting options are given
+    (e.g. indented debug output).
+    """
+
+    if orjson is not None:
+        _OPTIONS = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=self._OPTIONS).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+
+def json_response(obj, status=200, max_age=None):
+    """
+    Build a JSON response, serialized with orjson when available
+
+    Faster drop-in for `jsonify(obj), status` on frequently polled endpoints.
+
+    Args:
+        obj: JSON-serializable object
+        status: HTTP status code (default: 200)
+        max_age: If set, successful responses get a weak ETag and
+                 `Cache-Control: private, max-age=<max_age>`, and a matching
+                 If-None-Match returns 304 with an empty body
+
+    Returns:
+        Response: application/json response
+    """
+    return json_body_response(json_bytes(obj), status, max_age)
+
+
+def json_body_response(body, status=200, max_age=None):
+    """json_response() for an already serialized body"""
+    if max_age is None or status != 200:
+        return Response(body, status=status, mimetype='application/json')
+
+    etag = hashlib.blake2b(body, digest_size=8).hexdigest()
+    cache_control = f'private, max-age={max_age}'
+
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+    else:
+        response = Response(body, status=status, mimetype='application/json')
+
+    response.set_etag(etag, weak=True)
+    response.headers['Cache-Control'] = cache_control
+    return response
+
+
+# Last good body per status endpoint: {path: (fetched_at, body_bytes)}
+_response_cache = {}
+_response_cache_lock = threading.Lock()
+_response_cache_stats = {'hit': 0, 'miss': 0, 'stale': 0}
+
+# Oldest cached body (seconds) served when the upstream call fails
+STALE_MAX_AGE = 600
+
+# Log cache hit ratio every N lookups
+_CACHE_STATS_INTERVAL = 100
+
+
+def _count_cache_result(result):
+    """Tally a cache lookup; periodically log the hit ratio"""
+    with _response_cache_lock:
+        _response_cache_stats[result] += 1
+        total = sum(_response_cache_stats.values())
+        if total % _CACHE_STATS_INTERVAL:
+            return
+        stats = dict(_response_cache_stats)
+    kvlog(logger, logging.INFO, event='response_cache_stats', lookups=total,
+          hit=stats['hit'], miss=stats['miss'], stale=stats['stale'],
+          hit_ratio=f"{stats['hit'] / total:.2f}")
+
+
+def cached_body(key, ttl):
+    """
+    Decorator caching a JSON producer's successful body in memory under `key`
+
+    Producers return (status_code, body_bytes) and need no request context,
+    so a view and the /api/dashboard-status aggregator share one entry.
+    Dashboard tabs poll the device status endpoints every few seconds; each
+    miss is a 0.5-2 s vendor API call. Within `ttl` seconds the stored body
+    is returned directly. If the producer fails (non-200) and a body younger
+    than STALE_MAX_AGE exists, that body is returned instead.
+
+    Args:
+        key: Cache key (the endpoint path, as listed by /api/cache-stats)
+        ttl: Seconds a successful body is reused
+
+    Returns:
+        The decorated producer returns (status_code, body_bytes, cache)
+        where cache is 'hit', 'miss' or 'stale'
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function():
+            now = time.monotonic()
+            with _response_cache_lock:
+                entry = _response_cache.get(key)
+
+            if entry and now - entry[0] < ttl:
+                _count_cache_result('hit')
+                return 200, entry[1], 'hit'
+
+            status, body = f()
+
+            if status == 200:
+                with _response_cache_lock:
+                    _response_cache[key] = (now, body)
+            elif entry and now - entry[0] < STALE_MAX_AGE:
+                kvlog(logger, logging.WARNING, event='serving_stale', path=key,
+                      status=status, age_s=int(now - entry[0]))
+                _count_cache_result('stale')
+                return 200, entry[1], 'stale'
+
+            _count_cache_result('miss')
+            return status, body, 'miss'
+        return decorated_function
+    return decorator
+
+
+def cached_body_response(status, body, cache, max_age=STATUS_MAX_AGE):
+    """Response for a cached_body() producer result, with `X-Cache: hit|miss|stale`"""
+    response = json_body_response(body, status, max_age)
+    response.headers['X-Cache'] = cache
+    return response
+
+
+def clear_response_cache():
+    """Drop all cached status bodies (tests, config reload)"""
+    with _response_cache_lock:
+        _response_cache.clear()
+
+
+def response_cache_stats():
+    """
+    Snapshot of response cache counters since startup
+
+    Returns:
+        dict: hit/miss/stale counts, hit_ratio and cached entry ages by path
+    """
+    now = time.monotonic()
+    with _response_cache_lock:
+        stats = dict(_response_cache_stats)
+        ages = {path: round(now - fetched_at, 1) for path, (fetched_at, _) in _response_cache.items()}
+    lookups = sum(stats.values())
+    stats['lookups'] = lookups
+    stats['hit_ratio'] = round(stats['hit'] / lookups, 3) if lookups else None
+    stats['entries'] = ages
+    return stats
+
+
+# Persistent pool for blocking vendor API calls (no per-request thread startup)
+_UPSTREAM_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix='upstream')
+
+# Default seconds a request waits on a vendor API call
+UPSTREAM_TIMEOUT = 8
+
+
+def call_upstream(fn, timeout=None):
+    """
+    Run a blocking vendor API call on the upstream pool with a hard timeout
+
+    The request thread stops waiting after `timeout` seconds so it can answer
+    (e.g. with a stale cached body via cached_body) instead of hanging
+    on a slow vendor. The call itself finishes in the background.
+
+    Args:
+        fn: Zero-argument callable (e.g. get_nest().get_status)
+        timeout: Seconds to wait (default: UPSTREAM_TIMEOUT)
+
+    Returns:
+        Whatever fn returns
+
+    Raises:
+        TimeoutError: If fn has not finished within timeout
+    """
+    if timeout is None:
+        timeout = UPSTREAM_TIMEOUT
+    future = _UPSTREAM_POOL.submit(fn)
+    try:
+        return future.result(timeout=timeout)
+    except FuturesTimeoutError:
+        raise TimeoutError(f'Upstream call timed out after {timeout}s') from None
+
+
+# Content hashes of files in server/static/: {filename: version}
+_static_versions = {}
+
+
+def static_url(filename):
+    """
+    URL for a file in server/static/, versioned by content hash (?v=...)
+
+    The URL changes whenever the file does, so responses for it can be
+    cached as immutable (see STATIC_ASSET_MAX_AGE in server/routes.py).
+    Available in templates as {{ static_url('dashboard.js') }}.
+    """
+    version = None if current_app.debug else _static_versions.get(filename)
+    if version is None:
+        with open(os.path.join(current_app.static_folder, filename), 'rb') as f:
+            version = hashlib.blake2b(f.read(), digest_size=6).hexdigest()
+        _static_versions[filename] = version
+    return url_for('static', filename=filename, v=version)
+
+
+# Rendered static pages: {template_name: (html_bytes, gzip_bytes, brotli_bytes or None, etag)}
+_static_pages = {}
+
+
+def static_page_response(template_name, max_age=3600):
+    """
+    Serve a template with no dynamic content, rendered and compressed once
+
+    The page is rendered on first request and kept as raw, gzip and (when
+    the brotli package is installed) Brotli bytes with a strong ETag; later
+    requests only pick the right body. Debug mode re-renders every time so
+    template edits show up immediately.
+
+    Args:
+        template_name: Template in server/templates/
+        max_age: Browser cache lifetime in seconds (default: 1 hour)
+
+    Returns:
+        Response: text/html response (br or gzip if accepted), or 304 if ETag matches
+    """
+    page = None if current_app.debug else _static_pages.get(template_name)
+    if page is None:
+        html = render_template(template_name).encode('utf-8')
+        etag = hashlib.blake2b(html, digest_size=16).hexdigest()
+        html_br = brotli.compress(html, quality=11) if brotli is not None else None
+        page = (html, gzip.compress(html, 9), html_br, etag)
+        _static_pages[template_name] = page
+
+    html, html_gz, html_br, etag = page
+
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    elif html_br is not None and 'br' in request.accept_encodings:
+        response = Response(html_br, mimetype='text/html')
+        response.headers['Content-Encoding'] = 'br'
+    elif 'gzip' in request.accept_encodings:
+        response = Response(html_gz, mimetype='text/html')
+        response.headers['Content-Encoding'] = 'gzip'
+    else:
+        response = Response(html, mimetype='text/html')
+
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = f'public, max-age={max_age}'
+    response.vary.add('Accept-Encoding')
+    return response
+
+
+# Credentials as bytes for constant-time comparison
+_AUTH_USERNAME = config.AUTH_USERNAME.encode('utf-8')
+_AUTH_PASSWORD = config.AUTH_PASSWORD.encode('utf-8')
+
 
 def require_auth(f):
-    """Decorator to require basic authentication if enabled"""
+    """
+    Decorator to require basic authentication if enabled
+
+    Auth setting is checked once at decoration time: when disabled, the view
+    is returned unwrapped so protected routes pay no per-request overhead.
+    """
+    if not config.REQUIRE_AUTH:
+        return f
+
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        if not config.REQUIRE_AUTH:
-            return f(*args, **kwargs)
-
         auth = request.authorization
-        if not auth or auth.username != config.AUTH_USERNAME or auth.password != config.AUTH_PASSWORD:
+        if not auth:
+            return jsonify({'error': 'Authentication required'}), 401
+
+        # Constant-time compare; evaluate both to avoid leaking which one failed
+        username_ok = hmac.compare_digest((auth.username or '').encode('utf-8'), _AUTH_USERNAME)
+        password_ok = hmac.compare_digest((auth.password or '').encode('utf-8'), _AUTH_PASSWORD)
+        if not (username_ok & password_ok):
             return jsonify({'error': 'Authentication required'}), 401
 
         return f(*args, **kwargs)
     return decorated_function
 
 
+def _discover_automation_scripts(automations_dir):
+    """Map script filename -> absolute path for every automation script"""
+    try:
+        with os.scandir(automations_dir) as entries:
+            return {
+                entry.name: entry.path
+                for entry in entries
+                if entry.name.endswith('.py') and entry.is_file()
+            }
+    except OSError:
+        return {}
+
+
+# Automation scripts are fixed at deploy time; resolve once instead of per request
+AUTOMATION_SCRIPTS = _discover_automation_scripts(config.AUTOMATIONS_DIR)
+_PYTHON = sys.executable
+
+# Launched automation processes not yet reaped (pruned on each launch):
+# pids from posix_spawn, or Popen objects where posix_spawn is unavailable
+_running_automations = set()
+_running_automations_lock = threading.Lock()
+
+# posix_spawn avoids fork()ing the whole server process (Linux/macOS only)
+_posix_spawn = getattr(os, 'posix_spawn', None)
+
+# Child stdio goes to /dev/null: unread pipes would block the script once the buffer fills
+_SPAWN_FILE_ACTIONS = [
+    (os.POSIX_SPAWN_OPEN, 0, os.devnull, os.O_RDONLY, 0),
+    (os.POSIX_SPAWN_OPEN, 1, os.devnull, os.O_WRONLY, 0),
+    (os.POSIX_SPAWN_OPEN, 2, os.devnull, os.O_WRONLY, 0),
+] if _posix_spawn else None
+
+
+def _spawn_detached(cmd):
+    """
+    Start cmd in a new session with stdio on /dev/null, without waiting
+
+    Returns:
+        int | subprocess.Popen: pid (posix_spawn) or Popen object (fallback)
+    """
+    if _posix_spawn is not None:
+        return _posix_spawn(cmd[0], cmd, os.environ,
+                            file_actions=_SPAWN_FILE_ACTIONS, setsid=True)
+
+    return subprocess.Popen(
+        cmd,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        close_fds=True,
+        start_new_session=True  # Detach from parent process
+    )
+
+
+def _has_exited(proc):
+    """Reap proc (pid or Popen) if it has finished; True once it is gone"""
+    if isinstance(proc, int):
+        try:
+            pid, _ = os.waitpid(proc, os.WNOHANG)
+        except ChildProcessError:
+            return True
+        return pid != 0
+    return proc.poll() is not None
+
+
+def _reap_finished_automations():
+    """Collect exit status of finished automation processes (avoids zombies)"""
+    with _running_automations_lock:
+        finished = {proc for proc in _running_automations if _has_exited(proc)}
+        _running_automations.difference_update(finished)
+
+
 def run_automation_script(script_name, args=None):
     """
     Run an automation script in the background
@@ -42,14 +425,14 @@ def run_automation_script(script_name, args=None):
     Returns:
         dict: Response with status
     """
-    script_path = os.path.join(config.AUTOMATIONS_DIR, script_name)
+    script_path = AUTOMATION_SCRIPTS.get(script_name)
 
-    if not os.path.exists(script_path):
-        kvlog(logger, logging.ERROR, event='script_not_found', script=script_name, path=script_path)
+    if script_path is None:
+        kvlog(logger, logging.ERROR, event='script_not_found', script=script_name, dir=config.AUTOMATIONS_DIR)
         return {'error': f'Script not found: {script_name}'}, 404
 
     # Build command
-    cmd = [sys.executable, script_path]
+    cmd = [_PYTHON, script_path]
 
     # Check for dry_run query parameter (takes precedence over config)
     dry_run = request.args.get('dry_run', '').lower() == 'true'
@@ -61,13 +444,13 @@ def run_automation_script(script_name, args=None):
         cmd.extend(args)
 
     try:
+        _reap_finished_automations()
+
         # Run in background (don't wait for completion)
-        subprocess.Popen(
-            cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            start_new_session=True  # Detach from parent process
-        )
+        proc = _spawn_detached(cmd)
+
+        with _running_automations_lock:
+            _running_automations.add(proc)
 
         kvlog(logger, logging.INFO, event='automation_started', script=script_name, args=str(args or []))
         return {
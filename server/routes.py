@@ -5,17 +5,300 @@ Defines all HTTP endpoints for iOS Shortcuts integration.
 """
 
 import os
-import sys
-import subprocess
 import logging
 import time
-from flask import request, jsonify, render_template
-from server import config
-from server.helpers import require_auth, run_automation_script
+import hashlib
+import threading
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from flask import request, Response
+from server import config, __version__
+from server.helpers import require_auth, run_automation_script, static_page_response, static_url, json_bytes
+from server.blueprints import api_device, api_system, logs
 from lib.logging_config import kvlog
 
 logger = logging.getLogger(__name__)
 
+# Health check payload (constant, served by health_check_middleware)
+HEALTH_CHECK = {
+    'service': 'py_home webhook server',
+    'status': 'running',
+    'version': __version__
+}
+_HEALTH_BYTES = json_bytes(HEALTH_CHECK)
+_HEALTH_HEADERS = [
+    ('Content-Type', 'application/json'),
+    ('Content-Length', str(len(_HEALTH_BYTES)))
+]
+
+# Constant error bodies, serialized once
+_NOT_FOUND_BYTES = json_bytes({'error': 'Endpoint not found'})
+_INTERNAL_ERROR_BYTES = json_bytes({'error': 'Internal server error'})
+
+
+# Browser cache lifetime (seconds) for the dashboard page; data is fetched separately
+DASHBOARD_MAX_AGE = 300
+
+# Browser cache lifetime (seconds) for the aggregate card data: short enough to
+# stay live, long enough that overlapping fetches from one browser share a response
+DASHBOARD_STATUS_MAX_AGE = 2
+
+# Browser cache lifetime (seconds) for versioned static assets (one year)
+STATIC_ASSET_MAX_AGE = 31536000
+
+# Sources merged by /api/dashboard-status: (key, producer, timeout in seconds).
+# Producers are the functions behind each card's own endpoint; they return
+# (status_code, JSON body bytes, ...) and need no request context
+DASHBOARD_SOURCES = (
+    ('nest', api_device.nest_status, 10),
+    ('sensibo', api_device.sensibo_status, 10),
+    ('tapo', api_device.tapo_status, 30),
+    ('tempstick', api_device.tempstick_status, 10),
+    ('presence', api_system.presence_status, 5),
+    ('system_status', api_system.system_status, 5),
+    ('logs', partial(logs.reversed_tail, 'automations.log', 20), 5),
+)
+
+# Persistent pool for the dashboard fan-out (no per-request thread startup).
+# One worker per source: a source runs at most once at a time (see
+# _run_dashboard_source), so work outliving its timeout can't starve the rest
+_DASHBOARD_POOL = ThreadPoolExecutor(max_workers=len(DASHBOARD_SOURCES), thread_name_prefix='dashboard')
+
+# Latest run per dashboard source: {key: Future}
+_dashboard_runs = {}
+_dashboard_runs_lock = threading.Lock()
+
+# /api/dashboard/stream: seconds between refreshes, seconds before the server
+# ends a stream (EventSource reconnects), and concurrent streams allowed -
+# each open stream holds one of gunicorn's 8 threads
+DASHBOARD_STREAM_INTERVAL = 5
+DASHBOARD_STREAM_MAX_AGE = 300
+DASHBOARD_STREAM_LIMIT = 2
+
+_dashboard_streams = 0
+_dashboard_streams_lock = threading.Lock()
+
+# Endpoints advertised by /status
+STATUS_ENDPOINTS = (
+    '/dashboard',
+    '/leaving-home',
+    '/goodnight',
+    '/im-home',
+    '/good-morning',
+    '/travel-time',
+    '/update-location',
+    '/location',
+    '/logs',
+    '/logs/<filename>',
+    '/status'
+)
+
+
+def health_check_middleware(wsgi_app):
+    """
+    WSGI middleware that answers `GET /` before Flask dispatch
+
+    Uptime monitors poll the health check frequently; serving the constant
+    payload here skips URL routing, request hooks and per-request logging.
+    """
+    def middleware(environ, start_response):
+        if environ.get('PATH_INFO') == '/' and environ.get('REQUEST_METHOD') == 'GET':
+            start_response('200 OK', _HEALTH_HEADERS)
+            return [_HEALTH_BYTES]
+        return wsgi_app(environ, start_response)
+    return middleware
+
+
+def _run_dashboard_source(key, producer):
+    """
+    Future for a dashboard source's producer
+
+    A run still in progress (e.g. one that outlived its timeout on an
+    earlier request) is shared rather than started again, so concurrent
+    dashboard requests and SSE streams never stack up runs of one source.
+    """
+    with _dashboard_runs_lock:
+        future = _dashboard_runs.get(key)
+        if future is None or future.done():
+            future = _DASHBOARD_POOL.submit(producer)
+            _dashboard_runs[key] = future
+    return future
+
+
+def log_request_start():
+    """Log incoming request and start timer"""
+    request.start_time = time.monotonic_ns()
+    if logger.isEnabledFor(logging.DEBUG):
+        kvlog(logger, logging.DEBUG,
+              event='request_start',
+              method=request.method,
+              path=request.path,
+              client=request.remote_addr)
+
+
+def log_request_end(response):
+    """Log request completion with timing"""
+    if hasattr(request, 'start_time'):
+        duration_ms = (time.monotonic_ns() - request.start_time) // 1_000_000
+        kvlog(logger, logging.NOTICE,
+              event='request_complete',
+              method=request.method,
+              path=request.path,
+              status=response.status_code,
+              duration_ms=duration_ms)
+    return response
+
+
+def cache_versioned_static(response):
+    """Versioned asset URLs (static_url) never change content: cache for good"""
+    if request.endpoint == 'static' and 'v' in request.args and response.status_code == 200:
+        response.headers['Cache-Control'] = f'public, max-age={STATIC_ASSET_MAX_AGE}, immutable'
+    return response
+
+
+# GET / is normally answered by health_check_middleware; route kept for HEAD
+# and for apps created without the middleware
+def index():
+    """Health check endpoint"""
+    return Response(_HEALTH_BYTES, mimetype='application/json')
+
+
+# Auth setting is fixed for the life of the process; serialize payload once
+_STATUS_BYTES = json_bytes({
+    'service': 'py_home',
+    'status': 'running',
+    'auth_required': config.REQUIRE_AUTH,
+    'endpoints': list(STATUS_ENDPOINTS)
+})
+
+
+def status():
+    """Detailed status endpoint"""
+    return Response(_STATUS_BYTES, mimetype='application/json')
+
+
+def dashboard():
+    """Real-time system status dashboard (HTML UI)"""
+    # Static template: rendered and gzipped once, then served from memory
+    return static_page_response('dashboard.html', max_age=DASHBOARD_MAX_AGE)
+
+
+def _dashboard_payload():
+    """
+    Run every DASHBOARD_SOURCES producer in parallel and merge the results
+
+    Returns:
+        bytes: JSON object {key: {"status": code, "data": body}}
+    """
+    start = time.monotonic()
+    futures = [
+        (key, _run_dashboard_source(key, producer), timeout)
+        for key, producer, timeout in DASHBOARD_SOURCES
+    ]
+
+    parts = []
+    for key, future, timeout in futures:
+        try:
+            # Cached producers also report hit/miss/stale; not needed here
+            status, body = future.result(timeout=max(0, start + timeout - time.monotonic()))[:2]
+        except FuturesTimeoutError:
+            status, body = 504, json_bytes({'error': f'{key} timed out after {timeout}s'})
+        except Exception as e:
+            kvlog(logger, logging.ERROR, event='dashboard_source_failed', source=key,
+                  error_type=type(e).__name__, error_msg=str(e))
+            status, body = 500, json_bytes({'error': str(e)})
+        # Splice each source's JSON bytes as-is instead of decoding and re-encoding
+        parts.append(b'"%s":{"status":%d,"data":%s}' % (key.encode(), status, body))
+
+    return b'{' + b','.join(parts) + b'}'
+
+
+def dashboard_status():
+    """
+    All dashboard card data in one response
+
+    Source producers run in parallel on a persistent thread pool. Each source
+    is reported on its own as {key: {"status": code, "data": body}}, so
+    one slow or failing vendor doesn't fail the whole payload; a source
+    that misses its timeout gets status 504.
+    """
+    payload = _dashboard_payload()
+    response = Response(payload, mimetype='application/json')
+    response.headers['Cache-Control'] = f'private, max-age={DASHBOARD_STATUS_MAX_AGE}'
+    return response
+
+
+def _dashboard_events():
+    """
+    Server-Sent Events for the dashboard: the /api/dashboard-status payload
+    whenever it changes, a comment line as heartbeat otherwise
+
+    Ends after DASHBOARD_STREAM_MAX_AGE so a thread is never held forever;
+    the browser's EventSource reconnects on its own.
+    """
+    started = time.monotonic()
+    last_digest = None
+    yield f'retry: {DASHBOARD_STREAM_INTERVAL * 1000}\n\n'.encode()
+
+    while time.monotonic() - started < DASHBOARD_STREAM_MAX_AGE:
+        payload = _dashboard_payload()
+        digest = hashlib.blake2b(payload, digest_size=8).digest()
+        if digest != last_digest:
+            last_digest = digest
+            yield b'data: ' + payload + b'\n\n'
+        else:
+            # Heartbeat: a dropped client raises here and ends the stream
+            yield b': unchanged\n\n'
+        time.sleep(DASHBOARD_STREAM_INTERVAL)
+
+
+def _release_dashboard_stream():
+    """Free a stream slot once the response is closed (ended or client gone)"""
+    global _dashboard_streams
+    with _dashboard_streams_lock:
+        _dashboard_streams -= 1
+
+
+def dashboard_stream():
+    """
+    Dashboard card data pushed over one long-lived connection (SSE)
+
+    Returns 503 once DASHBOARD_STREAM_LIMIT streams are open; the dashboard
+    then falls back to polling /api/dashboard-status.
+    """
+    global _dashboard_streams
+    with _dashboard_streams_lock:
+        if _dashboard_streams >= DASHBOARD_STREAM_LIMIT:
+            return Response(json_bytes({'error': 'Too many dashboard streams'}),
+                            status=503, mimetype='application/json')
+        _dashboard_streams += 1
+
+    response = Response(_dashboard_events(), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.call_on_close(_release_dashboard_stream)
+    return response
+
+
+def not_found(e):
+    """Handle 404 errors"""
+    return Response(_NOT_FOUND_BYTES, status=404, mimetype='application/json')
+
+
+def internal_error(e):
+    """Handle 500 errors"""
+    logger.error(f"Internal server error: {e}")
+    return Response(_INTERNAL_ERROR_BYTES, status=500, mimetype='application/json')
+
+
+# App-level GET routes: (path, view); endpoint names are the view names
+ROUTES = (
+    ('/', index),
+    ('/status', status),
+    ('/dashboard', dashboard),
+    ('/api/dashboard-status', dashboard_status),
+    ('/api/dashboard/stream', dashboard_stream),
+)
+
 
 def register_routes(app):
     """Register all routes with the Flask app"""
@@ -37,74 +320,15 @@ def register_routes(app):
     app.register_blueprint(api_admin_bp)
     app.register_blueprint(ai_bp)
 
-    @app.before_request
-    def log_request_start():
-        """Log incoming request and start timer"""
-        request.start_time = time.time()
-        kvlog(logger, logging.DEBUG,
-              event='request_start',
-              method=request.method,
-              path=request.path,
-              client=request.remote_addr)
+    app.before_request(log_request_start)
+    app.after_request(log_request_end)
+    app.after_request(cache_versioned_static)
+    app.add_template_global(static_url)
+
+    for path, view in ROUTES:
+        app.add_url_rule(path, view_func=view)
 
-    @app.after_request
-    def log_request_end(response):
-        """Log request completion with timing"""
-        if hasattr(request, 'start_time'):
-            duration_ms = int((time.time() - request.start_time) * 1000)
-            kvlog(logger, logging.NOTICE,
-                  event='request_complete',
-                  method=request.method,
-                  path=request.path,
-                  status=response.status_code,
-                  duration_ms=duration_ms)
-        return response
-
-    @app.route('/')
-    def index():
-        """Health check endpoint"""
-        return jsonify({
-            'service': 'py_home webhook server',
-            'status': 'running',
-            'version': '1.0.0'
-        })
-
-    @app.route('/status')
-    def status():
-        """Detailed status endpoint"""
-        return jsonify({
-            'service': 'py_home',
-            'status': 'running',
-            'auth_required': config.REQUIRE_AUTH,
-            'endpoints': [
-                '/dashboard',
-                '/leaving-home',
-                '/goodnight',
-                '/im-home',
-                '/good-morning',
-                '/travel-time',
-                '/update-location',
-                '/location',
-                '/logs',
-                '/logs/<filename>',
-                '/status'
-            ]
-        })
-
-    @app.route('/dashboard')
-    def dashboard():
-        """Real-time system status dashboard (HTML UI)"""
-        return render_template('dashboard.html')
-
-    @app.errorhandler(404)
-    def not_found(e):
-        """Handle 404 errors"""
-        return jsonify({'error': 'Endpoint not found'}), 404
-
-    @app.errorhandler(500)
-    def internal_error(e):
-        """Handle 500 errors"""
-        logger.error(f"Internal server error: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+    app.register_error_handler(404, not_found)
+    app.register_error_handler(500, internal_error)
 
     logger.info("Routes registered successfully")
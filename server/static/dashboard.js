@@ -0,0 +1,603 @@
+// Fetch with timeout helper
+async function fetchWithTimeout(url, timeout = 5000) {
+    const controller = new AbortController();
+    const id = setTimeout(() => controller.abort(), timeout);
+
+    try {
+        const response = await fetch(url, { signal: controller.signal });
+        clearTimeout(id);
+        return response;
+    } catch (error) {
+        clearTimeout(id);
+        throw error;
+    }
+}
+
+// Auto-refresh: only visible tabs poll, and only one tab (the leader)
+// fetches; it shares results with other open tabs over BroadcastChannel
+const REFRESH_INTERVAL_MS = 5000;
+const LEADER_KEY = 'py_home_dash_leader';
+const LEADER_TTL_MS = REFRESH_INTERVAL_MS * 3;
+const tabId = Math.random().toString(36).slice(2);
+const dashChannel = 'BroadcastChannel' in window ? new BroadcastChannel('py_home_dash') : null;
+let autoRefreshDisabled = false;
+
+function readLeaderLock() {
+    try {
+        return JSON.parse(localStorage.getItem(LEADER_KEY));
+    } catch (e) {
+        return null;
+    }
+}
+
+function claimLeadership() {
+    // Without a channel there is no one to share with; always fetch
+    if (!dashChannel) return true;
+
+    const now = Date.now();
+    const lock = readLeaderLock();
+    if (lock && lock.id !== tabId && lock.expires > now) return false;
+
+    try {
+        localStorage.setItem(LEADER_KEY, JSON.stringify({ id: tabId, expires: now + LEADER_TTL_MS }));
+    } catch (e) {
+        // Storage unavailable: fetch independently
+    }
+    return true;
+}
+
+function releaseLeadership() {
+    const lock = readLeaderLock();
+    if (lock && lock.id === tabId) {
+        localStorage.removeItem(LEADER_KEY);
+    }
+}
+
+// The leader tab prefers a pushed stream (SSE) over polling; on a stream
+// error (e.g. 503 when the server is at its stream limit) it polls instead
+const STREAM_URL = '/api/dashboard/stream';
+let dashStream = null;
+let streamFailed = !('EventSource' in window);
+
+function openStream() {
+    if (streamFailed) return false;
+    if (dashStream) return true;
+
+    dashStream = new EventSource(STREAM_URL);
+    dashStream.onmessage = (event) => applySources(JSON.parse(event.data));
+    dashStream.onerror = () => {
+        // CONNECTING means the browser is retrying on its own
+        if (dashStream && dashStream.readyState === EventSource.CLOSED) {
+            dashStream = null;
+            streamFailed = true;
+            loadDashboard();
+        }
+    };
+    return true;
+}
+
+function closeStream() {
+    if (dashStream) {
+        dashStream.close();
+        dashStream = null;
+    }
+}
+
+function refreshTick() {
+    if (!claimLeadership()) {
+        closeStream();
+        return;
+    }
+    // While streaming, ticks only renew the leader lock
+    if (!openStream()) loadDashboard();
+}
+
+function startAutoRefresh() {
+    clearInterval(window.dashboardRefreshInterval);
+    window.dashboardRefreshInterval = setInterval(refreshTick, REFRESH_INTERVAL_MS);
+}
+
+function stopAutoRefresh() {
+    clearInterval(window.dashboardRefreshInterval);
+    window.dashboardRefreshInterval = null;
+    closeStream();
+    releaseLeadership();
+}
+
+function disableAutoRefresh() {
+    autoRefreshDisabled = true;
+    stopAutoRefresh();
+}
+
+// /api/dashboard-status keys -> card data: name used by renderDashboard,
+// fallback fields when a source fails, and per-source post-processing
+const sourceMap = {
+    nest: {
+        name: 'nest',
+        fallback: { current_temp_f: 0, mode: 'UNKNOWN', hvac_status: 'ERROR' },
+        prepare: markFresh
+    },
+    sensibo: {
+        name: 'sensibo',
+        fallback: { on: false, mode: 'unknown', current_temp_f: 0 },
+        prepare: markFresh
+    },
+    tapo: {
+        name: 'tapo',
+        fallback: { devices: [] },
+        prepare: markFresh
+    },
+    tempstick: {
+        name: 'tempstick',
+        fallback: { temperature_f: 0, humidity: 0, is_online: false },
+        prepare: markFresh
+    },
+    presence: {
+        name: 'presence',
+        fallback: { state: 'unknown', is_home: null },
+        prepare: data => {
+            // Stale after 5 minutes (300 seconds)
+            data._stale = data.age_seconds !== null && data.age_seconds > 300;
+            data._error = false;
+            return data;
+        }
+    },
+    system_status: {
+        name: 'systemStatus',
+        fallback: { status: 'error', flask_uptime: 'unknown', night_mode: false, automations_enabled: false },
+        prepare: markFresh
+    },
+    logs: {
+        name: 'logs',
+        fallback: { content: '' },
+        missing: { content: 'No logs available', _error: false },
+        // Server already returns the lines newest first (reverse=1)
+        prepare: data => ({ content: data.content, _error: false })
+    }
+};
+
+// Longest source timeout on the server (Tapo, 30s) plus margin
+const DASHBOARD_TIMEOUT_MS = 35000;
+
+function markFresh(data) {
+    data._stale = false;
+    data._error = false;
+    return data;
+}
+
+function toCardData(entry, source) {
+    if (entry && entry.status === 200) return source.prepare(entry.data);
+    if (entry && entry.status === 404 && source.missing) return { ...source.missing };
+
+    const message = entry && entry.data && entry.data.error ? entry.data.error : 'No data';
+    return { ...source.fallback, _error: true, error: message };
+}
+
+async function loadDashboard() {
+    try {
+        // One request; the server fetches all sources in parallel
+        const response = await fetchWithTimeout('/api/dashboard-status', DASHBOARD_TIMEOUT_MS);
+        if (!response.ok) throw new Error(`HTTP ${response.status}`);
+        applySources(await response.json());
+    } catch (error) {
+        // Error replaces the grid; next render rebuilds it
+        cardSlots.clear();
+        document.getElementById('dashboard').innerHTML = `
+            <div class="error">Failed to load dashboard: ${error.message}</div>
+        `;
+    }
+}
+
+// Render a /api/dashboard-status payload (polled or streamed)
+function applySources(sources) {
+    const data = {};
+    const payloads = {};
+    for (const [key, source] of Object.entries(sourceMap)) {
+        data[source.name] = toCardData(sources[key], source);
+        payloads[source.name] = JSON.stringify(sources[key]);
+    }
+    renderDashboard(data, payloads);
+
+    // Share with other tabs so they don't fetch too
+    if (dashChannel) dashChannel.postMessage({ data, payloads });
+}
+
+// Cards in grid order: data key -> renderer
+const CARD_RENDERERS = [
+    ['nest', renderNestCard],
+    ['sensibo', renderSensiboCard],
+    ['tempstick', renderTempStickCard],
+    ['tapo', renderTapoCard],
+    ['presence', renderPresenceCard],
+    ['systemStatus', renderSystemCard],
+    ['logs', renderLogsCard]
+];
+
+// Grid skeleton is built once; each slot keeps its element, the raw source
+// payload it was rendered from and its last markup. A card whose payload is
+// unchanged is not re-rendered at all; one whose markup is unchanged is not
+// re-parsed
+const cardSlots = new Map();
+
+function buildGrid() {
+    const grid = document.createElement('div');
+    grid.className = 'grid';
+    cardSlots.clear();
+    for (const [name] of CARD_RENDERERS) {
+        const el = document.createElement('div');
+        el.className = 'card-slot';
+        grid.appendChild(el);
+        cardSlots.set(name, { el, payload: null, html: null });
+    }
+    document.getElementById('dashboard').replaceChildren(grid);
+}
+
+function renderDashboard(data, payloads) {
+    if (!cardSlots.size) buildGrid();
+
+    for (const [name, render] of CARD_RENDERERS) {
+        const slot = cardSlots.get(name);
+        const payload = payloads ? payloads[name] : null;
+        if (payload !== null && payload === slot.payload) continue;
+        slot.payload = payload;
+
+        const html = render(data[name]);
+        if (slot.html !== html) {
+            slot.el.innerHTML = html;
+            slot.html = html;
+        }
+    }
+
+    document.getElementById('lastUpdated').textContent = 'Last updated: ' + new Date().toLocaleTimeString();
+}
+
+function formatAge(ageSeconds) {
+    if (ageSeconds === null) return 'unknown';
+    if (ageSeconds < 60) return Math.round(ageSeconds) + 's ago';
+    if (ageSeconds < 3600) return Math.round(ageSeconds / 60) + 'm ago';
+    return Math.round(ageSeconds / 3600) + 'h ago';
+}
+
+// Card markup is built with plain `+` concatenation: cheaper than large
+// template literals with many substitutions, re-run on every refresh
+
+// Shared warning rows for device cards, built once instead of per render
+const STALE_ROW = '<div class="status-row"><span class="status-warning">⚠️ Data may be stale</span></div>';
+const ERROR_ROW = '<div class="status-row"><span class="status-error">❌ Error loading data</span></div>';
+
+function warningRows(data) {
+    return (data._error ? ERROR_ROW : '') + (data._stale ? STALE_ROW : '');
+}
+
+function renderNestCard(data) {
+    const statusClass = data.hvac_status === 'OFF' ? 'status-good' : 'status-warning';
+
+    // Determine target temperature display
+    let targetTemp = '';
+    if (data.eco_mode === 'MANUAL_ECO' && data.eco_heat_f && data.eco_cool_f) {
+        // In ECO mode: show range
+        targetTemp = 'ECO (' + data.eco_heat_f + '-' + data.eco_cool_f + '°F)';
+    } else if (data.heat_setpoint_f) {
+        targetTemp = data.heat_setpoint_f + '°F';
+    } else if (data.cool_setpoint_f) {
+        targetTemp = data.cool_setpoint_f + '°F';
+    } else {
+        targetTemp = 'N/A';
+    }
+
+    return '<div class="card">' +
+        '<div class="card-title">🏠 Nest Thermostat</div>' +
+        warningRows(data) +
+        '<div class="temp-display">' + data.current_temp_f + '°F</div>' +
+        '<div class="status-row"><span class="status-label">Mode</span>' +
+            '<span class="status-value">' + data.mode + '</span></div>' +
+        '<div class="status-row"><span class="status-label">Target</span>' +
+            '<span class="status-value">' + targetTemp + '</span></div>' +
+        '<div class="status-row"><span class="status-label">HVAC</span>' +
+            '<span class="status-value ' + statusClass + '">' + data.hvac_status + '</span></div>' +
+        '<div class="status-row"><span class="status-label">Humidity</span>' +
+            '<span class="status-value">' + (data.current_humidity != null ? data.current_humidity + '%' : 'N/A') + '</span></div>' +
+    '</div>';
+}
+
+function renderSensiboCard(data) {
+    const hvacStatus = data.on ? 'RUNNING' : 'OFF';
+    const statusClass = data.on ? 'status-warning' : 'status-good';
+
+    return '<div class="card">' +
+        '<div class="card-title">🛏️ Sensibo AC (Master Suite)</div>' +
+        warningRows(data) +
+        '<div class="temp-display">' + data.current_temp_f + '°F</div>' +
+        '<div class="status-row"><span class="status-label">Mode</span>' +
+            '<span class="status-value">' + data.mode.toUpperCase() + '</span></div>' +
+        '<div class="status-row"><span class="status-label">Target</span>' +
+            '<span class="status-value">' + data.target_temp_f + '°F</span></div>' +
+        '<div class="status-row"><span class="status-label">HVAC</span>' +
+            '<span class="status-value ' + statusClass + '">' + hvacStatus + '</span></div>' +
+        '<div class="status-row"><span class="status-label">Humidity</span>' +
+            '<span class="status-value">' + (data.current_humidity != null ? data.current_humidity + '%' : 'N/A') + '</span></div>' +
+    '</div>';
+}
+
+function renderTempStickCard(data) {
+    const statusBadge = data.is_online ? 'badge-online' : 'badge-offline';
+    const statusText = data.is_online ? 'ONLINE' : 'OFFLINE';
+
+    // Battery level color
+    let batteryClass = 'status-good';
+    if (data.battery_pct < 20) batteryClass = 'status-error';
+    else if (data.battery_pct < 50) batteryClass = 'status-warning';
+
+    return '<div class="card">' +
+        '<div class="card-title">🌡️ Crawl Space</div>' +
+        warningRows(data) +
+        '<div class="temp-display">' + data.temperature_f + '°F</div>' +
+        '<div class="status-row"><span class="status-label">Humidity</span>' +
+            '<span class="status-value">' + data.humidity + '%</span></div>' +
+        '<div class="status-row"><span class="status-label">Battery</span>' +
+            '<span class="status-value ' + batteryClass + '">' + data.battery_pct + '%</span></div>' +
+        '<div class="status-row"><span class="status-label">Sensor</span>' +
+            '<span class="badge ' + statusBadge + '">' + statusText + '</span></div>' +
+    '</div>';
+}
+
+function renderTapoCard(data) {
+
+    let rows = '';
+    for (const device of data.devices) {
+        rows += '<div class="status-row"><span class="status-label">' + device.name + '</span>' +
+            '<span class="badge ' + (device.on ? 'badge-online' : 'badge-offline') + '">' + (device.on ? 'ON' : 'OFF') + '</span></div>';
+    }
+
+    return '<div class="card">' +
+        '<div class="card-title">💡 Smart Outlets</div>' +
+        warningRows(data) +
+        rows +
+    '</div>';
+}
+
+// Presence source -> user-friendly name (module-level singleton, not rebuilt per render)
+const PRESENCE_SOURCE_NAMES = Object.freeze({
+    'presence_monitor': 'iOS Geofencing',
+    'legacy': 'iOS Geofencing',
+    'unknown': 'Unknown'
+});
+
+function renderPresenceCard(data) {
+    const locationBadge = data.is_home === true ? 'badge-home' :
+                          data.is_home === false ? 'badge-away' : 'badge-offline';
+    const locationText = data.is_home === true ? 'HOME' :
+                         data.is_home === false ? 'AWAY' : 'UNKNOWN';
+
+    // Check if data is stale (>5 minutes)
+    const isStale = data.age_seconds !== null && data.age_seconds > 300;
+    const ageText = formatAge(data.age_seconds);
+    const staleClass = isStale ? 'status-warning' : '';
+    const errorWarning = data._error ? '<div class="status-row"><span class="status-error">❌ Error loading presence</span></div>' : '';
+    const sourceName = PRESENCE_SOURCE_NAMES[data.source] || data.source || 'Unknown';
+
+    const lastChecked = data.last_updated
+        ? '<div class="status-row"><span class="status-label">Last Checked</span>' +
+              '<span class="status-value ' + staleClass + '">' + (isStale ? '⚠️ ' : '') + ageText + '</span></div>'
+        : '';
+
+    return '<div class="card">' +
+        '<div class="card-title">📍 Presence</div>' +
+        errorWarning +
+        '<div class="status-row"><span class="status-label">Status</span>' +
+            '<span class="badge ' + locationBadge + '">' + locationText + '</span></div>' +
+        lastChecked +
+        '<div class="status-row"><span class="status-label">Source</span>' +
+            '<span class="status-value">' + sourceName + '</span></div>' +
+    '</div>';
+}
+
+function renderSystemCard(data) {
+    const modeBadge = data.night_mode ? 'badge-warning' : 'badge-online';
+    const modeText = data.night_mode ? 'NIGHT MODE' : 'DAY MODE';
+
+    const statusBadge = data.status === 'operational' ? 'badge-online' :
+                       data.status === 'degraded' ? 'badge-warning' : 'badge-offline';
+    const statusText = data.status === 'operational' ? 'OPERATIONAL' :
+                      data.status === 'degraded' ? 'DEGRADED' : 'ERROR';
+
+    const automationsBadge = data.automations_enabled ? 'badge-online' : 'badge-offline';
+    const automationsText = data.automations_enabled ? 'ENABLED' : 'DISABLED';
+
+    const errorWarning = data._error ? '<div class="status-row"><span class="status-error">❌ Error loading system status</span></div>' : '';
+
+    const toggleColor = data.automations_enabled ? '#d29922' : '#3fb950';
+    const toggleBackground = data.automations_enabled ? '#392f1a' : '#1a472a';
+
+    return '<div class="card">' +
+        '<div class="card-title">⚙️ System</div>' +
+        errorWarning +
+        '<div class="status-row"><span class="status-label">Status</span>' +
+            '<span class="badge ' + statusBadge + '">' + statusText + '</span></div>' +
+        '<div class="status-row"><span class="status-label">Mode</span>' +
+            '<span class="badge ' + modeBadge + '">' + modeText + '</span></div>' +
+        '<div class="status-row"><span class="status-label">Automations</span>' +
+            '<span class="badge ' + automationsBadge + '">' + automationsText + '</span></div>' +
+        '<div class="status-row"><span class="status-label">Flask Uptime</span>' +
+            '<span class="status-value">' + (data.flask_uptime || 'unknown') + '</span></div>' +
+        '<div style="margin-top: 15px; padding-top: 15px; border-top: 1px solid #21262d;">' +
+            '<div style="display: flex; gap: 5px; margin-bottom: 10px;">' +
+                '<button onclick="toggleAutomations(' + data.automations_enabled + ')" id="automationToggleBtn"' +
+                    ' style="flex: 1; background: ' + toggleBackground + '; border: 1px solid ' + toggleColor + '; color: ' + toggleColor + ';' +
+                    ' padding: 8px; border-radius: 6px; cursor: pointer; font-size: 12px; font-weight: 600;"' +
+                    ' onmouseover="this.style.opacity=\'0.8\'" onmouseout="this.style.opacity=\'1\'">' +
+                    (data.automations_enabled ? '⏸️ Disable Automations' : '▶️ Enable Automations') +
+                '</button>' +
+                '<button onclick="controlService(\'restart\')"' +
+                    ' style="flex: 1; background: #21262d; border: 1px solid #30363d; color: #c9d1d9;' +
+                    ' padding: 8px; border-radius: 6px; cursor: pointer; font-size: 12px; font-weight: 600;"' +
+                    ' onmouseover="this.style.background=\'#30363d\'" onmouseout="this.style.background=\'#21262d\'">' +
+                    '🔄 Restart Flask' +
+                '</button>' +
+            '</div>' +
+            '<button onclick="shutdownPi()" id="shutdownBtn"' +
+                ' style="width: 100%; background: #3d1f1f; border: 1px solid #f85149; color: #f85149;' +
+                ' padding: 10px; border-radius: 6px; cursor: pointer; font-size: 14px; font-weight: 600;"' +
+                ' onmouseover="this.style.background=\'#4a2626\'" onmouseout="this.style.background=\'#3d1f1f\'">' +
+                '🔌 Shutdown Pi' +
+            '</button>' +
+            '<div id="serviceStatus" style="margin-top: 10px; text-align: center; font-size: 12px; color: #8b949e;"></div>' +
+        '</div>' +
+    '</div>';
+}
+
+function renderLogsCard(data) {
+    const errorWarning = data._error ? '<div class="status-row"><span class="status-error">❌ Error loading logs</span></div>' : '';
+    const logContent = data.content || 'No logs available';
+
+    return '<div class="card card-wide">' +
+        '<div class="card-title">📜 Recent Activity</div>' +
+        errorWarning +
+        '<div class="log-preview">' + logContent + '</div>' +
+        '<a href="/logs" class="view-logs-link">View Full Logs →</a>' +
+    '</div>';
+}
+
+async function controlService(action) {
+    const status = document.getElementById('serviceStatus');
+    const actionText = action === 'stop' ? 'Stop' : action === 'restart' ? 'Restart' : 'Start';
+
+    if (!confirm(`${actionText} Flask server?\\n\\n${action === 'stop' ? 'Dashboard will become unavailable.' : action === 'restart' ? 'Dashboard will reload in ~5 seconds.' : 'Flask will start.'}`)) {
+        return;
+    }
+
+    status.innerHTML = `<span style="color: #d29922;">⏳ ${actionText}ing Flask...</span>`;
+
+    try {
+        const response = await fetch('/api/service-control', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ action })
+        });
+        const data = await response.json();
+
+        if (response.ok) {
+            status.innerHTML = `<span style="color: #3fb950;">✓ ${actionText} initiated</span>`;
+
+            if (action === 'restart') {
+                setTimeout(() => {
+                    status.innerHTML = '<span style="color: #d29922;">⏳ Waiting for Flask...</span>';
+                    setTimeout(() => window.location.reload(), 5000);
+                }, 2000);
+            } else if (action === 'stop') {
+                disableAutoRefresh();
+                setTimeout(() => {
+                    status.innerHTML = '<span style="color: #8b949e;">Flask stopped. Refresh page to reconnect.</span>';
+                }, 2000);
+            }
+        } else {
+            status.innerHTML = `<span style="color: #f85149;">❌ ${data.message || 'Failed'}</span>`;
+        }
+    } catch (error) {
+        status.innerHTML = `<span style="color: #f85149;">❌ ${error.message}</span>`;
+    }
+}
+
+async function toggleAutomations(currentlyEnabled) {
+    const status = document.getElementById('serviceStatus');
+    const action = currentlyEnabled ? 'disable' : 'enable';
+
+    if (!confirm(`${action === 'disable' ? 'Disable' : 'Enable'} all automations?\\n\\n${action === 'disable' ? 'Home automations will stop running but dashboard stays active.' : 'Home automations will resume normal operation.'}`)) {
+        return;
+    }
+
+    status.innerHTML = `<span style="color: #d29922;">⏳ ${action === 'disable' ? 'Disabling' : 'Enabling'} automations...</span>`;
+
+    try {
+        const response = await fetch('/api/automation-control', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ enable: !currentlyEnabled })
+        });
+        const data = await response.json();
+
+        if (response.ok) {
+            status.innerHTML = `<span style="color: #3fb950;">✓ Automations ${action === 'disable' ? 'disabled' : 'enabled'}</span>`;
+            // Reload dashboard to show new status
+            setTimeout(() => loadDashboard(), 1000);
+        } else {
+            status.innerHTML = `<span style="color: #f85149;">❌ ${data.message || 'Failed'}</span>`;
+        }
+    } catch (error) {
+        status.innerHTML = `<span style="color: #f85149;">❌ ${error.message}</span>`;
+    }
+}
+
+async function shutdownPi() {
+    const btn = document.getElementById('shutdownBtn');
+    const status = document.getElementById('serviceStatus');
+
+    if (!confirm('Shutdown the Raspberry Pi?\\n\\nThe system will power down. Wait for the LED to stop blinking before unplugging power.')) {
+        return;
+    }
+
+    btn.disabled = true;
+    btn.textContent = '⏳ Shutting down...';
+    btn.style.cursor = 'not-allowed';
+    btn.style.opacity = '0.6';
+
+    try {
+        const response = await fetch('/api/shutdown', { method: 'POST' });
+        const data = await response.json();
+
+        if (response.ok) {
+            status.innerHTML = '<span style="color: #d29922;">⚠️ System shutting down<br>Wait for LED to stop blinking<br>Then safe to unplug power</span>';
+
+            // Stop auto-refresh
+            disableAutoRefresh();
+
+            // Show countdown
+            let seconds = 60;
+            const countdown = setInterval(() => {
+                status.innerHTML = `<span style="color: #d29922;">⚠️ Shutdown in progress (${seconds}s)<br>LED will stop blinking soon<br>Then safe to unplug</span>`;
+                seconds--;
+                if (seconds < 0) {
+                    clearInterval(countdown);
+                    status.innerHTML = '<span style="color: #3fb950;">✓ System halted<br>LED should be OFF<br>Safe to unplug power now</span>';
+                }
+            }, 1000);
+        } else {
+            status.innerHTML = `<span style="color: #f85149;">❌ ${data.message || 'Shutdown failed'}</span>`;
+            btn.disabled = false;
+            btn.textContent = '🔌 Shutdown Pi';
+            btn.style.cursor = 'pointer';
+            btn.style.opacity = '1';
+        }
+    } catch (error) {
+        status.innerHTML = `<span style="color: #f85149;">❌ ${error.message}</span>`;
+        btn.disabled = false;
+        btn.textContent = '🔌 Shutdown Pi';
+        btn.style.cursor = 'pointer';
+        btn.style.opacity = '1';
+    }
+}
+
+// Render results fetched by the leader tab
+if (dashChannel) {
+    dashChannel.onmessage = (event) => {
+        if (!autoRefreshDisabled) renderDashboard(event.data.data, event.data.payloads);
+    };
+}
+
+// Pause polling while the tab is hidden
+document.addEventListener('visibilitychange', () => {
+    if (autoRefreshDisabled) return;
+    if (document.hidden) {
+        stopAutoRefresh();
+    } else {
+        refreshTick();
+        startAutoRefresh();
+    }
+});
+window.addEventListener('pagehide', releaseLeadership);
+
+// Load dashboard on page load (a new stream sends its first payload at once)
+if (document.hidden || !(claimLeadership() && openStream())) loadDashboard();
+
+// Auto-refresh every 5 seconds (streamed when the server allows)
+if (!document.hidden) startAutoRefresh();
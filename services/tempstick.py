@@ -12,11 +12,11 @@ Setup:
 API Docs: https://tempstickapi.com/docs/
 """
 
-import requests
 import logging
 import time
 from datetime import datetime, timezone
 from lib.logging_config import kvlog
+from lib.http_session import create_session
 
 logger = logging.getLogger(__name__)
 
@@ -49,6 +49,9 @@ class TempStickAPI:
                 "Add TEMPSTICK_SENSOR_ID to config/.env or sensor_id to config.yaml"
             )
 
+        # Pooled HTTP session: reuses TLS connections across API calls
+        self.session = create_session()
+
     def _get(self, endpoint):
         """Make GET request to Temp Stick API"""
         url = f"{self.BASE_URL}/{endpoint}"
@@ -56,7 +59,7 @@ class TempStickAPI:
 
         api_start = time.time()
         try:
-            resp = requests.get(url, headers=headers, timeout=10)
+            resp = self.session.get(url, headers=headers, timeout=10)
             resp.raise_for_status()
 
             result = resp.json()
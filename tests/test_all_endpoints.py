@@ -9,13 +9,16 @@ This ensures all endpoints are registered, accept correct methods, and return ex
 import pytest
 from unittest.mock import patch, Mock, MagicMock
 import json
+import threading
 
 
 @pytest.fixture
 def client():
     """Create test client"""
     from server.app import app
+    from server.helpers import clear_response_cache
     app.config['TESTING'] = True
+    clear_response_cache()
     with app.test_client() as client:
         yield client
 
@@ -53,6 +56,14 @@ def test_status_endpoint(client):
                 assert 'nest' in data or 'status' in data
 
 
+def test_unknown_endpoint_returns_json_404(client):
+    """Test unknown paths get the JSON 404 body"""
+    response = client.get('/no-such-endpoint')
+    assert response.status_code == 404
+    assert response.mimetype == 'application/json'
+    assert response.get_json() == {'error': 'Endpoint not found'}
+
+
 # ====================
 # Automation Endpoints
 # ====================
@@ -113,14 +124,14 @@ def test_good_morning_endpoint(client, mock_auth):
 
 def test_api_nest_status(client):
     """Test GET /api/nest/status returns Nest data"""
-    with patch('components.nest.NestAPI') as mock_nest_class:
+    with patch('components.nest.get_nest') as mock_get_nest:
         mock_instance = Mock()
         mock_instance.get_status.return_value = {
             'current_temp_f': 72.5,
             'mode': 'HEAT',
             'hvac_status': 'OFF'
         }
-        mock_nest_class.return_value = mock_instance
+        mock_get_nest.return_value = mock_instance
 
         response = client.get('/api/nest/status')
         assert response.status_code == 200
@@ -130,8 +141,8 @@ def test_api_nest_status(client):
 
 def test_api_sensibo_status(client):
     """Test GET /api/sensibo/status returns Sensibo data"""
-    with patch('components.sensibo.get_status') as mock_get:
-        mock_get.return_value = {
+    with patch('components.sensibo.get_sensibo') as mock_get_sensibo:
+        mock_get_sensibo.return_value.get_status.return_value = {
             'current_temp_f': 70.0,
             'on': True,
             'mode': 'heat'
@@ -145,13 +156,13 @@ def test_api_sensibo_status(client):
 
 def test_api_tapo_status(client):
     """Test GET /api/tapo/status returns Tapo outlets data"""
-    with patch('components.tapo.TapoAPI') as mock_tapo_class:
+    with patch('components.tapo.get_tapo') as mock_get_tapo:
         mock_instance = Mock()
         mock_instance.get_all_status.return_value = [
             {'name': 'Heater', 'on': False},
             {'name': 'Lamp', 'on': True}
         ]
-        mock_tapo_class.return_value = mock_instance
+        mock_get_tapo.return_value = mock_instance
 
         response = client.get('/api/tapo/status')
         assert response.status_code == 200
@@ -161,7 +172,7 @@ def test_api_tapo_status(client):
 
 def test_api_tempstick_status(client):
     """Test GET /api/tempstick/status returns TempStick sensor data"""
-    with patch('services.tempstick.TempStickAPI') as mock_tempstick_class:
+    with patch('services.tempstick.get_tempstick') as mock_get_tempstick:
         mock_instance = Mock()
         mock_instance.get_sensor_data.return_value = {
             'sensor_id': 'TS00EMA9JZ',
@@ -172,7 +183,7 @@ def test_api_tempstick_status(client):
             'battery_pct': 100,
             'is_online': True
         }
-        mock_tempstick_class.return_value = mock_instance
+        mock_get_tempstick.return_value = mock_instance
 
         response = client.get('/api/tempstick/status')
         assert response.status_code == 200
@@ -201,9 +212,53 @@ def test_api_presence(client):
         os.unlink(temp_file)
 
 
+def test_api_presence_reads_state_file(client, tmp_path, monkeypatch):
+    """Test /api/presence reports the state file and reuses its stat within the TTL"""
+    from server.blueprints import api_system
+
+    state_file = tmp_path / '.presence_state'
+    monkeypatch.setattr(api_system, '_PRESENCE_STATE_FILE', str(state_file))
+    monkeypatch.setattr(api_system, '_presence_check', (0.0, None))
+
+    assert client.get('/api/presence').get_json()['state'] == 'unknown'
+
+    # Within PRESENCE_CHECK_TTL the cached "missing" result is reused
+    state_file.write_text('home')
+    assert client.get('/api/presence').get_json()['state'] == 'unknown'
+
+    monkeypatch.setattr(api_system, 'PRESENCE_CHECK_TTL', 0)
+    data = client.get('/api/presence').get_json()
+    assert data['state'] == 'home'
+    assert data['is_home'] is True
+
+
+def test_api_presence_rereads_only_on_mtime_change(client, tmp_path, monkeypatch):
+    """Test /api/presence skips re-reading an unchanged state file"""
+    import os
+    from server.blueprints import api_system
+
+    state_file = tmp_path / '.presence_state'
+    state_file.write_text('away')
+    monkeypatch.setattr(api_system, '_PRESENCE_STATE_FILE', str(state_file))
+    monkeypatch.setattr(api_system, '_presence_check', (0.0, None))
+    monkeypatch.setattr(api_system, '_presence_state', (None, None))
+    monkeypatch.setattr(api_system, 'PRESENCE_CHECK_TTL', 0)
+
+    assert client.get('/api/presence').get_json()['state'] == 'away'
+
+    # Same mtime: cached contents are served
+    stat = os.stat(state_file)
+    state_file.write_text('home')
+    os.utime(state_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert client.get('/api/presence').get_json()['state'] == 'away'
+
+    os.utime(state_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert client.get('/api/presence').get_json()['state'] == 'home'
+
+
 def test_api_automation_control_get(client):
     """Test GET /api/automation-control returns dry-run status"""
-    with patch('lib.config.get', return_value=True):
+    with patch('server.blueprints.api_system.get', return_value=True):
         response = client.get('/api/automation-control')
         assert response.status_code == 200
         data = json.loads(response.data)
@@ -222,6 +277,9 @@ def test_api_automation_control_post(client, mock_auth):
 
 def test_api_night_mode_get(client):
     """Test GET /api/night-mode returns sleep time state (deprecated endpoint)"""
+    from lib.hvac_logic import _sleep_time_bucketed
+    _sleep_time_bucketed.cache_clear()
+
     with patch('lib.hvac_logic.is_sleep_time') as mock_check:
         mock_check.return_value = True
 
@@ -255,6 +313,18 @@ def test_location_get(client):
         assert 'lat' in data or 'error' in data
 
 
+def test_location_get_fresh_bypasses_eta_cache(client):
+    """Test GET /location?fresh=1 asks for a live ETA"""
+    location = {'lat': 45.7076, 'lng': -121.5366, 'is_home': False}
+    with patch('lib.location.get_location', return_value=location), \
+            patch('lib.location.get_eta_home', return_value={'duration_in_traffic_minutes': 9}) as mock_eta:
+        client.get('/location')
+        client.get('/location?fresh=1')
+
+    assert mock_eta.call_args_list[0].kwargs == {'fresh': False}
+    assert mock_eta.call_args_list[1].kwargs == {'fresh': True}
+
+
 def test_update_location_post(client, mock_auth):
     """Test POST /update-location updates location"""
     with patch('lib.location.update_location') as mock_update:
@@ -273,6 +343,81 @@ def test_update_location_post(client, mock_auth):
             assert response.status_code == 200
 
 
+def test_update_location_debounces_repeat_trigger(client, mock_auth):
+    """Test repeated geofence trigger within window doesn't rerun automation"""
+    from server.blueprints import location as location_bp_module
+    location_bp_module._LAST_TRIGGER.clear()
+
+    eta = {'duration_in_traffic_minutes': 8}
+    with patch('lib.location.update_location') as mock_update, \
+            patch('lib.location.should_trigger_arrival', return_value=(True, 'lights')) as mock_should, \
+            patch('lib.location.get_eta_home', return_value=eta) as mock_eta, \
+            patch('server.blueprints.location.run_automation_script') as mock_run:
+        mock_update.return_value = {
+            'status': 'updated',
+            'distance_from_home_meters': 900,
+            'is_home': False,
+            'trigger': 'near_home'
+        }
+
+        first = client.post('/update-location', json={'lat': 45.7, 'lng': -121.5, 'trigger': 'near_home'})
+        second = client.post('/update-location', json={'lat': 45.7, 'lng': -121.5, 'trigger': 'near_home'})
+
+        assert first.status_code == 200
+        assert second.status_code == 200
+        assert json.loads(second.data)['message'] == 'debounced'
+        assert json.loads(second.data)['automation_triggered'] == 'lights'
+        assert mock_run.call_count == 1
+        assert mock_eta.call_count == 1
+        assert mock_should.call_count == 1
+
+    location_bp_module._LAST_TRIGGER.clear()
+
+
+def test_update_location_coalesces_concurrent_triggers(client, mock_auth):
+    """Test duplicate trigger arriving during the ETA lookup doesn't launch twice"""
+    from server.blueprints import location as location_bp_module
+    location_bp_module._LAST_TRIGGER.clear()
+
+    responses = []
+
+    def slow_eta():
+        # Duplicate request lands while the first is still looking up the ETA
+        if not responses:
+            duplicate = threading.Thread(target=lambda: responses.append(client.application.test_client().post(
+                '/update-location', json={'lat': 45.7, 'lng': -121.5, 'trigger': 'near_home'})))
+            duplicate.start()
+            duplicate.join()
+        return {'duration_in_traffic_minutes': 8}
+
+    with patch('lib.location.update_location') as mock_update, \
+            patch('lib.location.should_trigger_arrival', return_value=(True, 'lights')), \
+            patch('lib.location.get_eta_home', side_effect=slow_eta), \
+            patch('server.blueprints.location.run_automation_script') as mock_run:
+        mock_update.side_effect = lambda *a: {'status': 'updated', 'distance_from_home_meters': 900}
+
+        first = client.post('/update-location', json={'lat': 45.7, 'lng': -121.5, 'trigger': 'near_home'})
+
+        assert json.loads(first.data)['automation_triggered'] == 'lights'
+        assert json.loads(responses[0].data)['message'] == 'debounced'
+        assert mock_run.call_count == 1
+
+    location_bp_module._LAST_TRIGGER.clear()
+
+
+def test_update_location_no_trigger_does_not_debounce(client, mock_auth):
+    """Test an update that launches nothing leaves the trigger free"""
+    from server.blueprints import location as location_bp_module
+    location_bp_module._LAST_TRIGGER.clear()
+
+    with patch('lib.location.update_location',
+               return_value={'status': 'updated', 'distance_from_home_meters': 3000}), \
+            patch('lib.location.should_trigger_arrival', return_value=(False, None)):
+        client.post('/update-location', json={'lat': 45.7, 'lng': -121.5, 'trigger': 'near_home'})
+
+    assert 'near_home' not in location_bp_module._LAST_TRIGGER
+
+
 # ====================
 # Dashboard & UI Endpoints
 # ====================
@@ -284,6 +429,58 @@ def test_dashboard_endpoint(client):
     assert b'<html' in response.data or b'<!DOCTYPE' in response.data
 
 
+def test_dashboard_served_cached_and_gzipped(client):
+    """Dashboard page is pre-rendered: gzip when accepted, cacheable for 5 minutes"""
+    import gzip
+
+    plain = client.get('/dashboard')
+    compressed = client.get('/dashboard', headers={'Accept-Encoding': 'gzip'})
+
+    assert compressed.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(compressed.data) == plain.data
+    assert plain.headers['Cache-Control'] == 'public, max-age=300'
+    assert plain.headers['ETag'] == compressed.headers['ETag']
+
+
+def test_dashboard_served_brotli_when_available(client, monkeypatch):
+    """Dashboard page is pre-compressed with Brotli when the package is installed"""
+    from types import SimpleNamespace
+    from server import helpers
+
+    fake_brotli = SimpleNamespace(compress=lambda data, quality: b'BR:' + data)
+    monkeypatch.setattr(helpers, 'brotli', fake_brotli)
+    monkeypatch.setattr(helpers, '_static_pages', {})
+
+    plain = client.get('/dashboard')
+    response = client.get('/dashboard', headers={'Accept-Encoding': 'gzip, br'})
+    assert response.headers['Content-Encoding'] == 'br'
+    assert response.data == b'BR:' + plain.data
+
+    # gzip-only clients still get gzip
+    response = client.get('/dashboard', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+
+
+def test_dashboard_assets_versioned_and_immutable(client):
+    """Dashboard CSS/JS are separate files under content-hashed, far-future cached URLs"""
+    import re
+
+    page = client.get('/dashboard').get_data(as_text=True)
+    urls = re.findall(r'(?:href|src)="(/static/dashboard\.(?:css|js)\?v=[0-9a-f]+)"', page)
+    assert len(urls) == 2
+
+    for url in urls:
+        response = client.get(url)
+        assert response.status_code == 200
+        assert 'immutable' in response.headers['Cache-Control']
+        response.close()
+
+    # Unversioned URLs keep the default revalidation behaviour
+    response = client.get('/static/dashboard.js')
+    assert 'immutable' not in response.headers.get('Cache-Control', '')
+    response.close()
+
+
 def test_logs_endpoint(client):
     """Test GET /logs returns logs page"""
     response = client.get('/logs')
@@ -304,6 +501,58 @@ def test_travel_time_endpoint(client):
         assert response.status_code in [200, 302, 404, 500]
 
 
+def test_travel_time_runs_in_process(client):
+    """Test /travel-time calls the automation directly (no subprocess)"""
+    with patch('server.blueprints.webhooks._travel_time_cache', {}), \
+         patch('server.blueprints.webhooks.get_travel_time') as mock_run:
+        mock_run.return_value = {'destination': 'Portland, OR', 'duration_in_traffic_minutes': 12}
+        with patch('subprocess.run') as mock_subprocess:
+            response = client.get('/travel-time?destination=Portland, OR')
+
+            assert response.status_code == 200
+            assert json.loads(response.data)['duration_in_traffic_minutes'] == 12
+            mock_run.assert_called_once_with('Portland, OR')
+            mock_subprocess.assert_not_called()
+
+
+def test_travel_time_cached_per_destination(client):
+    """Test repeated /travel-time lookups reuse the result within the TTL"""
+    with patch('server.blueprints.webhooks._travel_time_cache', {}), \
+         patch('server.blueprints.webhooks.get_travel_time') as mock_run:
+        mock_run.return_value = {'destination': 'Portland, OR', 'duration_in_traffic_minutes': 12}
+
+        first = client.get('/travel-time?destination=Portland, OR')
+        second = client.get('/travel-time?destination=Portland, OR')
+        client.get('/travel-time?destination=Seattle, WA')
+
+        assert first.get_json() == second.get_json()
+        assert mock_run.call_count == 2
+
+        # Failed lookups are not cached
+        mock_run.return_value = {'error': 'API down', 'destination': 'Boise, ID'}
+        client.get('/travel-time?destination=Boise, ID')
+        client.get('/travel-time?destination=Boise, ID')
+        assert mock_run.call_count == 4
+
+
+def test_travel_time_cache_is_bounded(client):
+    """Test expired and excess destinations are dropped from the /travel-time cache"""
+    from server.blueprints import webhooks
+
+    cache = {'Old, OR': (0.0, {'duration_in_traffic_minutes': 5})}
+    with patch.object(webhooks, '_travel_time_cache', cache), \
+         patch.object(webhooks, 'TRAVEL_TIME_CACHE_SIZE', 2), \
+         patch('server.blueprints.webhooks.get_travel_time') as mock_run:
+        mock_run.return_value = {'duration_in_traffic_minutes': 12}
+
+        client.get('/travel-time?destination=A')
+        assert list(cache) == ['A']
+
+        client.get('/travel-time?destination=B')
+        client.get('/travel-time?destination=C')
+        assert list(cache) == ['B', 'C']
+
+
 def test_add_task_endpoint(client, mock_auth):
     """Test POST /add-task adds task"""
     with patch('server.blueprints.webhooks.run_automation_script') as mock_run:
@@ -324,6 +573,13 @@ def test_ai_command_endpoint(client, mock_auth):
         assert response.status_code in [200, 404]  # May not be enabled
 
 
+def test_ai_command_requires_text(client, mock_auth):
+    """Test POST /ai-command without command text returns 400"""
+    response = client.post('/ai-command', json={})
+    assert response.status_code == 400
+    assert response.get_json() == {'error': 'Command text required'}
+
+
 # ====================
 # System Control Endpoints
 # ====================
@@ -332,12 +588,59 @@ def test_api_service_control(client, mock_auth):
     """Test POST /api/service-control manages system services"""
     # action must be stop, start, or restart (not 'status')
     with patch('subprocess.Popen'):
-        with patch('platform.system', return_value='Linux'):
+        with patch('server.blueprints.api_admin._PLATFORM', 'Linux'):
             response = client.post('/api/service-control',
                                   json={'action': 'restart'})
             assert response.status_code == 200
 
 
+def test_api_git_pull_skips_when_up_to_date(client, mock_auth, monkeypatch):
+    """Test /api/git-pull only fetches when HEAD already matches upstream"""
+    from subprocess import CompletedProcess
+    from server.blueprints import api_admin
+
+    commands = []
+
+    def fake_git(*args, timeout=15):
+        commands.append(args[0])
+        return CompletedProcess(args, 0, stdout='abc123\n', stderr='')
+
+    monkeypatch.setattr(api_admin, '_git', fake_git)
+
+    response = client.post('/api/git-pull', json={'restart_after': True})
+    assert response.status_code == 200
+    assert response.get_json()['changed'] is False
+    assert response.get_json()['restarting'] is False
+    assert commands == ['fetch', 'rev-parse', 'rev-parse']
+
+    # Every call fetches again: a push right after a check must still be seen
+    client.post('/api/git-pull', json={})
+    assert commands == ['fetch', 'rev-parse', 'rev-parse'] * 2
+
+
+def test_api_git_pull_pulls_after_new_push(client, mock_auth, monkeypatch):
+    """Test /api/git-pull pulls when upstream moved since the last up-to-date check"""
+    from subprocess import CompletedProcess
+    from server.blueprints import api_admin
+
+    upstream = ['abc123']
+    commands = []
+
+    def fake_git(*args, timeout=15):
+        commands.append(args[0])
+        sha = upstream[0] if args[-1] == '@{u}' else 'abc123'
+        return CompletedProcess(args, 0, stdout=sha + '\n', stderr='')
+
+    monkeypatch.setattr(api_admin, '_git', fake_git)
+
+    assert client.post('/api/git-pull', json={}).get_json()['changed'] is False
+
+    upstream[0] = 'def456'
+    response = client.post('/api/git-pull', json={})
+    assert response.get_json()['changed'] is True
+    assert commands[-1] == 'pull'
+
+
 def test_api_shutdown(client, mock_auth):
     """Test POST /api/shutdown initiates shutdown"""
     # Don't actually call this - just check it exists
@@ -382,6 +685,17 @@ def test_all_endpoints_registered(client):
     assert len(missing) <= 3, f"Too many missing endpoints: {missing}"
 
 
+def test_route_table_registered_by_view_name(client):
+    """Test every ROUTES entry is registered under its view function's name"""
+    from server.app import app
+    from server.routes import ROUTES
+
+    rules = {rule.rule: rule.endpoint for rule in app.url_map.iter_rules()}
+    for path, view in ROUTES:
+        assert rules[path] == view.__name__
+        assert app.view_functions[view.__name__] is view
+
+
 def test_automation_endpoints_accept_post(client):
     """Verify automation endpoints accept POST method"""
     from server.app import app
@@ -398,3 +712,353 @@ def test_automation_endpoints_accept_post(client):
         rule = next((r for r in app.url_map.iter_rules() if r.rule == path), None)
         if rule:
             assert 'POST' in rule.methods, f"{path} should accept POST"
+
+
+# ====================
+# Response Helpers
+# ====================
+
+def test_json_response_uses_json_mimetype(client):
+    """Test json_response() builds an application/json response"""
+    from server.app import app
+    from server.helpers import json_response
+
+    with app.test_request_context():
+        response = json_response({'status': 'ok'}, 201)
+        assert response.status_code == 201
+        assert response.mimetype == 'application/json'
+        assert json.loads(response.data) == {'status': 'ok'}
+
+
+def test_json_response_falls_back_without_orjson(client):
+    """Test json_response() works when orjson is not installed"""
+    from server.app import app
+    from server.helpers import json_response
+
+    with patch('server.helpers.orjson', None):
+        with app.test_request_context():
+            response = json_response({'temp': 72.5})
+            assert response.status_code == 200
+            assert json.loads(response.data) == {'temp': 72.5}
+
+
+def test_status_endpoint_etag_returns_304(client):
+    """Test /api/nest/status sends a weak ETag and honors If-None-Match"""
+    with patch('components.nest.get_nest') as mock_get_nest:
+        mock_get_nest.return_value.get_status.return_value = {'current_temp_f': 72.5, 'mode': 'HEAT'}
+
+        response = client.get('/api/nest/status')
+        assert response.status_code == 200
+        assert 'max-age=3' in response.headers['Cache-Control']
+        etag = response.headers['ETag']
+        assert etag.startswith('W/')
+
+        response = client.get('/api/nest/status', headers={'If-None-Match': etag})
+        assert response.status_code == 304
+        assert response.data == b''
+
+
+def test_status_endpoint_cached_between_polls(client):
+    """Test /api/nest/status reuses the vendor response within its TTL"""
+    with patch('components.nest.get_nest') as mock_get_nest:
+        mock_get_nest.return_value.get_status.return_value = {'current_temp_f': 72.5}
+
+        first = client.get('/api/nest/status')
+        second = client.get('/api/nest/status')
+
+        assert first.headers['X-Cache'] == 'miss'
+        assert second.headers['X-Cache'] == 'hit'
+        assert second.data == first.data
+        assert mock_get_nest.return_value.get_status.call_count == 1
+
+
+def test_device_status_reuses_client_instance(client):
+    """Test device endpoints use the component singleton, not a new client per poll"""
+    with patch('components.tapo.client.TapoAPI') as mock_tapo_class, \
+         patch('components.tapo.client._tapo', None):
+        mock_tapo_class.return_value.get_all_status.return_value = []
+        from server.helpers import clear_response_cache
+
+        client.get('/api/tapo/status')
+        clear_response_cache()
+        client.get('/api/tapo/status')
+
+        assert mock_tapo_class.call_count == 1
+        assert mock_tapo_class.return_value.get_all_status.call_count == 2
+
+
+def test_cache_stats_reports_hits_and_entries(client, monkeypatch):
+    """Test /api/cache-stats exposes response cache counters"""
+    from server import helpers
+
+    monkeypatch.setattr(helpers, '_response_cache_stats', {'hit': 0, 'miss': 0, 'stale': 0})
+
+    with patch('components.nest.get_nest') as mock_get_nest:
+        mock_get_nest.return_value.get_status.return_value = {'current_temp_f': 72.5}
+        client.get('/api/nest/status')
+        client.get('/api/nest/status')
+
+    stats = client.get('/api/cache-stats').get_json()
+    assert stats['hit'] == 1
+    assert stats['miss'] == 1
+    assert stats['hit_ratio'] == 0.5
+    assert '/api/nest/status' in stats['entries']
+
+
+def test_status_endpoint_serves_stale_on_upstream_error(client):
+    """Test /api/nest/status falls back to the last good body when Nest fails"""
+    from server import helpers
+
+    with patch('components.nest.get_nest') as mock_get_nest:
+        mock_get_nest.return_value.get_status.return_value = {'current_temp_f': 72.5}
+        good = client.get('/api/nest/status')
+
+        # Expire the entry, then make the vendor call fail
+        fetched_at, body = helpers._response_cache['/api/nest/status']
+        helpers._response_cache['/api/nest/status'] = (fetched_at - 60, body)
+        mock_get_nest.return_value.get_status.side_effect = Exception('API down')
+
+        response = client.get('/api/nest/status')
+        assert response.status_code == 200
+        assert response.headers['X-Cache'] == 'stale'
+        assert response.data == good.data
+
+
+def test_status_endpoint_serves_stale_on_upstream_timeout(client):
+    """Test a slow vendor call stops blocking the request after the timeout"""
+    import time
+    from server import helpers
+
+    with patch('components.nest.get_nest') as mock_get_nest, \
+         patch.object(helpers, 'UPSTREAM_TIMEOUT', 0.05):
+        mock_get_nest.return_value.get_status.return_value = {'current_temp_f': 72.5}
+        good = client.get('/api/nest/status')
+
+        fetched_at, body = helpers._response_cache['/api/nest/status']
+        helpers._response_cache['/api/nest/status'] = (fetched_at - 60, body)
+        mock_get_nest.return_value.get_status.side_effect = lambda: time.sleep(0.5)
+
+        start = time.monotonic()
+        response = client.get('/api/nest/status')
+        assert time.monotonic() - start < 0.4
+        assert response.headers['X-Cache'] == 'stale'
+        assert response.data == good.data
+
+        helpers.clear_response_cache()
+        assert client.get('/api/nest/status').status_code == 504
+
+
+def test_dashboard_status_aggregates_sources(client):
+    """Test /api/dashboard-status returns every card source in one response"""
+    from server.routes import DASHBOARD_SOURCES
+
+    with patch('components.nest.get_nest') as mock_get_nest, \
+         patch('components.sensibo.get_sensibo') as mock_get_sensibo, \
+         patch('components.tapo.get_tapo') as mock_get_tapo, \
+         patch('services.tempstick.get_tempstick') as mock_get_tempstick:
+        mock_get_nest.return_value.get_status.return_value = {'current_temp_f': 72.5}
+        mock_get_sensibo.return_value.get_status.side_effect = Exception('API down')
+        mock_get_tapo.return_value.get_all_status.return_value = []
+        mock_get_tempstick.return_value.get_sensor_data.return_value = {'temperature_f': 68.0}
+
+        response = client.get('/api/dashboard-status')
+
+    assert response.status_code == 200
+    assert response.headers['Cache-Control'] == 'private, max-age=2'
+    assert 'Set-Cookie' not in response.headers
+    data = response.get_json()
+    assert set(data) == {key for key, _, _ in DASHBOARD_SOURCES}
+    assert data['nest'] == {'status': 200, 'data': {'current_temp_f': 72.5}}
+    assert data['tapo']['data'] == {'devices': []}
+
+    # A failing source is reported per key, not as an overall error
+    assert data['sensibo']['status'] == 500
+    assert 'error' in data['sensibo']['data']
+
+
+def test_dashboard_source_still_running_is_shared(monkeypatch):
+    """Test a source that outlived its timeout is not started again by the next payload"""
+    from server import routes
+
+    release = threading.Event()
+    calls = []
+
+    def slow_source():
+        calls.append(1)
+        release.wait(5)
+        return 200, b'{}'
+
+    monkeypatch.setattr(routes, 'DASHBOARD_SOURCES', (('slow', slow_source, 0.05),))
+    monkeypatch.setattr(routes, '_dashboard_runs', {})
+    try:
+        first = json.loads(routes._dashboard_payload())
+        second = json.loads(routes._dashboard_payload())
+    finally:
+        release.set()
+
+    assert first['slow']['status'] == second['slow']['status'] == 504
+    assert len(calls) == 1
+
+
+def test_dashboard_stream_pushes_payload(client, monkeypatch):
+    """Test /api/dashboard/stream sends the aggregate as an SSE data event"""
+    from server import routes
+
+    monkeypatch.setattr(routes, '_dashboard_payload', lambda: b'{"nest":{"status":200,"data":{}}}')
+
+    response = client.get('/api/dashboard/stream', buffered=False)
+    assert response.status_code == 200
+    assert response.mimetype == 'text/event-stream'
+
+    events = iter(response.response)
+    assert next(events).startswith(b'retry: ')
+    assert next(events) == b'data: {"nest":{"status":200,"data":{}}}\n\n'
+    assert routes._dashboard_streams == 1
+
+    response.close()
+    assert routes._dashboard_streams == 0
+
+
+def test_dashboard_stream_limit_returns_503(client, monkeypatch):
+    """Test streams beyond DASHBOARD_STREAM_LIMIT are refused so clients poll"""
+    from server import routes
+
+    monkeypatch.setattr(routes, 'DASHBOARD_STREAM_LIMIT', 0)
+
+    response = client.get('/api/dashboard/stream')
+    assert response.status_code == 503
+    assert routes._dashboard_streams == 0
+
+
+def test_require_auth_returns_view_unwrapped_when_disabled():
+    """Test require_auth adds no wrapper when auth is disabled"""
+    from server import helpers
+
+    def view():
+        return 'ok'
+
+    with patch.object(helpers.config, 'REQUIRE_AUTH', False):
+        assert helpers.require_auth(view) is view
+
+
+def test_require_auth_checks_credentials_when_enabled():
+    """Test require_auth rejects bad credentials and accepts good ones"""
+    from flask import Flask
+    from server import helpers
+
+    app = Flask(__name__)
+    with patch.object(helpers.config, 'REQUIRE_AUTH', True), \
+            patch.object(helpers, '_AUTH_USERNAME', b'admin'), \
+            patch.object(helpers, '_AUTH_PASSWORD', b'secret'):
+        app.add_url_rule('/protected', 'protected', helpers.require_auth(lambda: 'ok'))
+        test_client = app.test_client()
+
+        assert test_client.get('/protected').status_code == 401
+        assert test_client.get('/protected', auth=('admin', 'wrong')).status_code == 401
+        assert test_client.get('/protected', auth=('admin', 'secret')).status_code == 200
+
+
+def test_root_health_check_bypasses_flask_dispatch(client):
+    """Test GET / is answered by the WSGI middleware (no request hooks)"""
+    with patch('server.routes.kvlog') as mock_log:
+        response = client.get('/')
+        assert response.status_code == 200
+        assert response.mimetype == 'application/json'
+        assert json.loads(response.data)['status'] == 'running'
+        mock_log.assert_not_called()
+
+
+def test_run_automation_script_unknown_name_returns_404(client):
+    """Test unknown automation names are rejected without spawning anything"""
+    from server.app import app
+    from server.helpers import run_automation_script, AUTOMATION_SCRIPTS
+
+    assert 'im_home.py' in AUTOMATION_SCRIPTS
+
+    with patch('server.helpers._spawn_detached') as mock_spawn:
+        with app.test_request_context('/'):
+            result, status_code = run_automation_script('does_not_exist.py')
+
+        assert status_code == 404
+        assert 'error' in result
+        mock_spawn.assert_not_called()
+
+
+def test_run_automation_script_spawns_detached_and_reaps(client):
+    """Test automations launch via posix_spawn with /dev/null stdio and are reaped"""
+    import os
+    from server.app import app
+    from server import helpers
+
+    if helpers._posix_spawn is None:
+        pytest.skip('posix_spawn not available on this platform')
+
+    helpers._running_automations.clear()
+
+    with patch('server.helpers._posix_spawn', return_value=12345) as mock_spawn, \
+         patch.object(helpers.os, 'waitpid', return_value=(12345, 0)) as mock_waitpid:
+        with app.test_request_context('/'):
+            result, status_code = helpers.run_automation_script('im_home.py')
+            assert status_code == 200
+            assert 12345 in helpers._running_automations
+
+            args, kwargs = mock_spawn.call_args
+            assert args[1][1] == helpers.AUTOMATION_SCRIPTS['im_home.py']
+            assert kwargs['setsid'] is True
+            assert {action[1] for action in kwargs['file_actions']} == {0, 1, 2}
+            assert all(action[2] == os.devnull for action in kwargs['file_actions'])
+
+            # Next launch reaps the finished process
+            mock_spawn.return_value = 12346
+            helpers.run_automation_script('im_home.py')
+            mock_waitpid.assert_any_call(12345, os.WNOHANG)
+            assert helpers._running_automations == {12346}
+
+    helpers._running_automations.clear()
+
+
+def test_run_automation_script_falls_back_to_popen(client):
+    """Test automations use Popen with DEVNULL stdio where posix_spawn is missing"""
+    from server.app import app
+    from server import helpers
+
+    helpers._running_automations.clear()
+
+    with patch('server.helpers._posix_spawn', None), \
+         patch('subprocess.Popen') as mock_popen:
+        finished = Mock()
+        finished.poll.return_value = 0
+        mock_popen.return_value = finished
+
+        with app.test_request_context('/'):
+            result, status_code = helpers.run_automation_script('im_home.py')
+            assert status_code == 200
+            assert finished in helpers._running_automations
+
+            kwargs = mock_popen.call_args.kwargs
+            assert kwargs['stdout'] is helpers.subprocess.DEVNULL
+            assert kwargs['stderr'] is helpers.subprocess.DEVNULL
+            assert kwargs['start_new_session'] is True
+
+            # Next launch reaps the finished process
+            mock_popen.return_value = Mock()
+            helpers.run_automation_script('im_home.py')
+            assert finished not in helpers._running_automations
+
+    helpers._running_automations.clear()
+
+
+def test_json_provider_matches_default_output():
+    """Test orjson-backed jsonify keeps the default provider's output"""
+    import datetime
+    from flask.json.provider import DefaultJSONProvider
+    from server.app import app
+    from server.helpers import OrjsonProvider
+
+    assert isinstance(app.json, OrjsonProvider)
+    obj = {'b': 1, 'a': [1.5, None, '°F'], 'when': datetime.datetime(2025, 1, 2, 3, 4, 5)}
+    default = DefaultJSONProvider(app)
+
+    assert json.loads(app.json.dumps(obj)) == json.loads(default.dumps(obj))
+    assert app.json.dumps(obj).index('"a"') < app.json.dumps(obj).index('"b"')
+    assert app.json.loads(b'{"x": [1, 2]}') == {'x': [1, 2]}
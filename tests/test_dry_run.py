@@ -318,7 +318,7 @@ def test_api_status_returns_dry_run_flag(client):
             return True
         return original_get(key, default)
 
-    with patch('lib.config.get', side_effect=mock_get):
+    with patch('server.blueprints.api_system.get', side_effect=mock_get):
         response = client.get('/api/system-status')
         assert response.status_code == 200
 
@@ -331,7 +331,7 @@ def test_api_status_returns_dry_run_flag(client):
 
 def test_api_automation_control_reflects_config(client):
     """Test /api/automation-control returns current config value"""
-    with patch('lib.config.get', return_value=False):
+    with patch('server.blueprints.api_system.get', return_value=False):
         response = client.get('/api/automation-control')
         assert response.status_code == 200
 
@@ -38,7 +38,7 @@ def test_api_timeout_handling():
         sensibo = SensiboAPI()
 
         # Mock a timeout error
-        with patch('requests.get') as mock_get:
+        with patch('requests.Session.get') as mock_get:
             mock_get.side_effect = requests.exceptions.Timeout("Connection timed out")
 
             try:
@@ -99,7 +99,7 @@ def test_network_disconnection():
         from components.sensibo import SensiboAPI
 
         # Mock network error
-        with patch('requests.get') as mock_get:
+        with patch('requests.Session.get') as mock_get:
             mock_get.side_effect = requests.exceptions.ConnectionError("Network unreachable")
 
             sensibo = SensiboAPI()
@@ -191,7 +191,7 @@ def test_malformed_api_response():
         from components.sensibo import SensiboAPI
 
         # Mock malformed JSON response
-        with patch('requests.get') as mock_get:
+        with patch('requests.Session.get') as mock_get:
             mock_response = MagicMock()
             mock_response.json.side_effect = ValueError("Invalid JSON")
             mock_response.status_code = 200
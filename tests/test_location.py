@@ -277,6 +277,41 @@ def test_location_file_format():
             os.remove(temp_file)
 
 
+def test_eta_cache_ignores_gps_jitter():
+    """Test ETA lookups from nearly identical origins share one Maps call"""
+    print("Test 6: ETA Cache")
+
+    from unittest.mock import patch
+    import lib.location as loc_module
+
+    travel = {'duration_minutes': 20, 'duration_in_traffic_minutes': 25, 'distance_miles': 10.0,
+              'traffic_level': 'light'}
+    origins = [{'lat': 45.44621, 'lng': -122.63931}, {'lat': 45.44638, 'lng': -122.63912},
+               {'lat': 45.44638, 'lng': -122.63912}]
+    loc_module._eta_cache = (None, 0.0, None)
+
+    try:
+        with patch.object(loc_module, 'get_location', side_effect=origins), \
+                patch('services.google_maps.get_travel_time', return_value=travel) as mock_travel:
+            first = loc_module.get_eta_home()
+            second = loc_module.get_eta_home()
+            refreshed = loc_module.get_eta_home(fresh=True)
+
+        assert second is first
+        print("  ✓ Jittered origin reused cached ETA")
+
+        assert mock_travel.call_count == 2
+        assert refreshed is not first
+        assert loc_module._eta_cache[2] is refreshed
+        print("  ✓ fresh=True bypassed the cache and stored the new ETA")
+
+        print()
+        return True
+
+    finally:
+        loc_module._eta_cache = (None, 0.0, None)
+
+
 def main():
     """Run all tests"""
     print(f"{BLUE}{'='*70}{RESET}")
@@ -289,6 +324,7 @@ def main():
         test_get_location,
         test_should_trigger_arrival,
         test_location_file_format,
+        test_eta_cache_ignores_gps_jitter,
     ]
 
     passed = 0
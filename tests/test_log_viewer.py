@@ -0,0 +1,358 @@
+#!/usr/bin/env python
+"""
+Tests for Log Viewer Endpoints
+
+Tests tail/head reading of log files used by /logs/<filename>.
+"""
+
+import gzip
+import pytest
+
+from server.app import app
+from server.blueprints import logs
+
+
+@pytest.fixture
+def client():
+    """Flask test client"""
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+
+@pytest.fixture
+def logs_dir(tmp_path, monkeypatch):
+    """Point the log blueprint at an empty temporary log directory"""
+    log_dir = tmp_path.resolve()
+    monkeypatch.setattr(logs, 'LOGS_DIR', log_dir)
+    monkeypatch.setattr(logs, '_list_cache', {'ts': 0.0, 'body': None, 'etag': None, 'mtime': 0})
+    return log_dir
+
+
+def write_log(tmp_path, text, name='test.log'):
+    path = tmp_path / name
+    path.write_bytes(text.encode('utf-8'))
+    return str(path)
+
+
+@pytest.mark.parametrize('text', [
+    '',
+    'one line no newline',
+    'a\nb\nc\n',
+    'a\nb\nc',
+    '\n\n\n',
+    ''.join(f'line {i}\n' for i in range(5000)),
+])
+@pytest.mark.parametrize('lines', [1, 2, 3, 100, 4999, 10000])
+def test_tail_matches_readlines(tmp_path, monkeypatch, text, lines):
+    """Tail read returns the same lines as readlines()[-N:]"""
+    # Small chunks so multi-chunk scanning is exercised
+    monkeypatch.setattr(logs, 'READ_CHUNK_SIZE', 7)
+    path = write_log(tmp_path, text)
+
+    expected = ''.join(text.splitlines(keepends=True)[-lines:])
+    actual = b''.join(logs._read_tail(path, lines)).decode('utf-8')
+
+    assert actual == expected
+
+
+@pytest.mark.parametrize('lines', [1, 3, 50])
+def test_head_returns_first_lines(tmp_path, lines):
+    """Head read returns the first N lines"""
+    text = ''.join(f'line {i}\n' for i in range(10))
+    path = write_log(tmp_path, text)
+
+    expected = ''.join(text.splitlines(keepends=True)[:lines])
+    actual = b''.join(logs._read_head(path, lines)).decode('utf-8')
+
+    assert actual == expected
+
+
+def test_logs_ui_served_gzipped_with_etag(client):
+    """Log viewer page is served pre-compressed and revalidates with 304"""
+    response = client.get('/logs', headers={'Accept-Encoding': 'gzip'})
+    assert response.status_code == 200
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'max-age=3600' in response.headers['Cache-Control']
+    assert gzip.decompress(response.data)
+
+    etag = response.headers['ETag']
+    response = client.get('/logs', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.data == b''
+
+
+def test_list_logs_reuses_scan_within_ttl(client, monkeypatch, logs_dir):
+    """Polls within LIST_CACHE_TTL share one directory scan"""
+    scans = []
+
+    def fake_scan(log_dir):
+        scans.append(log_dir)
+        return [{'name': 'a.log', 'size_bytes': 1, 'modified': 1.0, 'url': '/logs/a.log'}]
+
+    monkeypatch.setattr(logs, '_scan_logs', fake_scan)
+
+    first = client.get('/logs?format=json')
+    second = client.get('/logs?format=json')
+    assert len(scans) == 1
+    assert first.data == second.data
+    assert first.get_json()['logs'][0]['name'] == 'a.log'
+
+    # Cached body still honors If-None-Match
+    cached = client.get('/logs?format=json', headers={'If-None-Match': first.headers['ETag']})
+    assert cached.status_code == 304
+
+    monkeypatch.setattr(logs, 'LIST_CACHE_TTL', 0)
+    client.get('/logs?format=json')
+    assert len(scans) == 2
+
+
+def test_list_logs_skips_directories(client, logs_dir):
+    """Listing includes regular files only"""
+    write_log(logs_dir, 'a\n', name='app.log')
+    (logs_dir / 'archive').mkdir()
+
+    data = client.get('/logs?format=json').get_json()
+
+    assert data['logs_directory'] == str(logs_dir)
+    assert [f['name'] for f in data['logs']] == ['app.log']
+
+
+@pytest.mark.parametrize('filename', ['..%2Fsecret.log', '..', '%2E%2E'])
+def test_view_log_rejects_traversal(client, logs_dir, filename):
+    """Names resolving outside the log directory are rejected"""
+    write_log(logs_dir.parent, 'secret\n', name='secret.log')
+
+    response = client.get(f'/logs/{filename}')
+
+    assert response.status_code in (400, 404)
+    assert b'secret' not in response.data
+
+
+def test_view_log_missing_file_returns_404(client, logs_dir):
+    """Unknown log names return 404"""
+    response = client.get('/logs/nope.log')
+    assert response.status_code == 404
+    assert response.get_json() == {'error': 'Log file not found'}
+
+
+def test_view_log_full_uses_send_file(client, logs_dir):
+    """?full=true returns the whole file and honors Range requests"""
+    write_log(logs_dir, 'one\ntwo\nthree\n', name='full.log')
+
+    response = client.get('/logs/full.log?full=true')
+    assert response.status_code == 200
+    assert response.data == b'one\ntwo\nthree\n'
+    assert response.mimetype == 'text/plain'
+
+    partial = client.get('/logs/full.log?full=true', headers={'Range': 'bytes=4-'})
+    assert partial.status_code == 206
+    assert partial.data == b'two\nthree\n'
+
+
+def test_view_log_since_returns_appended_bytes(client, logs_dir):
+    """?since=<X-Log-Size> returns only bytes appended after that offset"""
+    path = logs_dir / 'grow.log'
+    path.write_bytes(b'one\ntwo\n')
+
+    first = client.get('/logs/grow.log?format=text')
+    size = first.headers['X-Log-Size']
+    assert first.data == b'one\ntwo\n'
+    assert size == '8'
+
+    with open(path, 'ab') as f:
+        f.write(b'three\n')
+
+    delta = client.get(f'/logs/grow.log?format=text&since={size}')
+    assert delta.data == b'three\n'
+    assert delta.headers['X-Log-Size'] == '14'
+
+    # File truncated (rotated): client must reload the whole window
+    path.write_bytes(b'new\n')
+    assert client.get('/logs/grow.log?format=text&since=14').status_code == 416
+
+
+def test_head_groups_lines_into_blocks(tmp_path, monkeypatch):
+    """Head read yields a few blocks rather than one chunk per line"""
+    monkeypatch.setattr(logs, 'READ_CHUNK_SIZE', 64)
+    text = ''.join(f'line {i}\n' for i in range(100))
+    path = write_log(tmp_path, text)
+
+    blocks = list(logs._read_head(path, 100))
+
+    assert b''.join(blocks).decode('utf-8') == text
+    assert len(blocks) < 20
+
+
+def test_tail_offset_cached_until_file_changes(tmp_path):
+    """Repeated tails of an unchanged file reuse the computed offset"""
+    path = write_log(tmp_path, 'a\nb\nc\n')
+    logs._cached_tail_offset.cache_clear()
+
+    assert b''.join(logs._read_tail(path, 2)) == b'b\nc\n'
+    assert b''.join(logs._read_tail(path, 2)) == b'b\nc\n'
+    assert logs._cached_tail_offset.cache_info().hits == 1
+
+    with open(path, 'ab') as f:
+        f.write(b'd\n')
+    assert b''.join(logs._read_tail(path, 2)) == b'c\nd\n'
+
+
+def test_batch_logs_returns_windows_and_deltas(client, logs_dir):
+    """One /logs/batch request covers several files, full or incremental"""
+    write_log(logs_dir, 'a1\na2\na3\n', name='a.log')
+    write_log(logs_dir, 'b1\nb2\n', name='b.log')
+
+    response = client.get('/logs/batch?files=a.log,b.log,missing.log&lines=2&since=,3')
+    files = response.get_json()['files']
+
+    assert response.status_code == 200
+    assert files['a.log'] == {'content': 'a2\na3\n', 'size': 9, 'incremental': False}
+    assert files['b.log'] == {'content': 'b2\n', 'size': 6, 'incremental': True}
+    assert files['missing.log'] == {'error': 'Log file not found'}
+
+
+def test_batch_logs_requires_files(client, logs_dir):
+    """Empty batch is a client error"""
+    assert client.get('/logs/batch').status_code == 400
+
+
+def test_batch_logs_reports_unusable_names_per_file(client, logs_dir):
+    """Over-long names and NUL bytes are per-file 400-style errors, not a failed batch"""
+    write_log(logs_dir, 'ok\n', name='ok.log')
+    long_name = 'a' * 300 + '.log'
+
+    response = client.get(f'/logs/batch?files=ok.log,{long_name},bad%00.log')
+    files = response.get_json()['files']
+
+    assert response.status_code == 200
+    assert files['ok.log']['content'] == 'ok\n'
+    assert files[long_name] == {'error': 'Invalid filename'}
+    assert files['bad\x00.log'] == {'error': 'Invalid filename'}
+
+    assert client.get(f'/logs/{long_name}').status_code == 400
+
+
+@pytest.mark.parametrize('query', ['format=text', 'format=json', 'format=text&tail=false'])
+def test_view_log_gzips_when_accepted(client, logs_dir, query):
+    """Large windows are gzip-compressed for clients that accept it"""
+    text = ''.join(f'2025-01-01 00:00:00.000 INFO   [SYS   ] line {i}\n' for i in range(200))
+    write_log(logs_dir, text, name='big.log')
+
+    plain = client.get(f'/logs/big.log?{query}&lines=200')
+    compressed = client.get(f'/logs/big.log?{query}&lines=200', headers={'Accept-Encoding': 'gzip'})
+
+    assert 'Content-Encoding' not in plain.headers
+    assert compressed.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(compressed.data) == plain.data
+    assert len(compressed.data) < len(plain.data) // 4
+
+
+def test_view_log_small_body_not_gzipped(client, logs_dir):
+    """Tiny responses skip compression"""
+    write_log(logs_dir, 'one\n', name='small.log')
+
+    response = client.get('/logs/small.log?format=text', headers={'Accept-Encoding': 'gzip'})
+
+    assert 'Content-Encoding' not in response.headers
+    assert response.data == b'one\n'
+
+
+def test_view_log_if_modified_since(client, logs_dir):
+    """Last-Modified is sent and If-Modified-Since revalidates without a body"""
+    import os
+    path = logs_dir / 'ims.log'
+    path.write_bytes(b'one\n')
+    os.utime(path, (1700000000, 1700000000))
+
+    response = client.get('/logs/ims.log?format=text')
+    last_modified = response.headers['Last-Modified']
+
+    cached = client.get('/logs/ims.log?format=text', headers={'If-Modified-Since': last_modified})
+    assert cached.status_code == 304
+    assert cached.data == b''
+
+    os.utime(path, (1700000100, 1700000100))
+    fresh = client.get('/logs/ims.log?format=text', headers={'If-Modified-Since': last_modified})
+    assert fresh.status_code == 200
+
+
+def test_etag_takes_precedence_over_if_modified_since(client, logs_dir):
+    """A stale ETag wins over a matching If-Modified-Since"""
+    write_log(logs_dir, 'one\n', name='both.log')
+    last_modified = client.get('/logs/both.log?format=text').headers['Last-Modified']
+
+    response = client.get('/logs/both.log?format=text', headers={
+        'If-None-Match': 'W/"stale"',
+        'If-Modified-Since': last_modified,
+    })
+
+    assert response.status_code == 200
+
+
+def test_view_log_reverse_returns_newest_first(client, logs_dir):
+    """?reverse=1 returns the tail newest first, memoized until the file changes"""
+    path = logs_dir / 'auto.log'
+    path.write_bytes(b'one\ntwo\nthree\n')
+    logs._cached_reversed_tail.cache_clear()
+
+    first = client.get('/logs/auto.log?lines=2&reverse=1')
+    second = client.get('/logs/auto.log?lines=2&reverse=1', headers={'If-None-Match': 'W/"other"'})
+    assert first.get_json()['content'] == 'three\ntwo'
+    assert second.get_json()['content'] == 'three\ntwo'
+    assert logs._cached_reversed_tail.cache_info().hits == 1
+
+    with open(path, 'ab') as f:
+        f.write(b'four\n')
+    assert client.get('/logs/auto.log?lines=2&reverse=1').get_json()['content'] == 'four\nthree'
+    assert client.get('/logs/auto.log?lines=2').get_json()['content'] == 'three\nfour\n'
+
+
+def test_view_log_full_serves_suffix_range(client, logs_dir):
+    """?full=true honors suffix ranges so a client can fetch just the last bytes"""
+    write_log(logs_dir, 'one\ntwo\nthree\n', name='suffix.log')
+
+    response = client.get('/logs/suffix.log?full=true', headers={'Range': 'bytes=-6'})
+
+    assert response.status_code == 206
+    assert response.data == b'three\n'
+    assert response.headers['Content-Range'] == 'bytes 8-13/14'
+
+
+def test_view_log_filters_lines_server_side(client, logs_dir):
+    """level/automation/grep drop non-matching lines from the window"""
+    write_log(logs_dir, (
+        '2025-01-01 00:00:00.000 INFO   [AUTO  ] automation=im_home event=start\n'
+        '2025-01-01 00:00:01.000 ERROR  [AUTO  ] automation=im_home device=nest error_msg=Timeout\n'
+        '2025-01-01 00:00:02.000 ERROR  [AUTO  ] automation=goodnight device=tapo error_msg=timeout\n'
+        '2025-01-01 00:00:03.000 INFO   [SYS   ] partial line'
+    ), name='filter.log')
+
+    response = client.get('/logs/filter.log?format=text&level=ERROR&automation=home&grep=TIMEOUT')
+    assert response.data.decode().splitlines() == [
+        '2025-01-01 00:00:01.000 ERROR  [AUTO  ] automation=im_home device=nest error_msg=Timeout',
+        # Unterminated last line is kept so ?since= reads can continue it
+        '2025-01-01 00:00:03.000 INFO   [SYS   ] partial line',
+    ]
+
+    other = client.get('/logs/filter.log?format=text&level=ERROR&grep=timeout',
+                       headers={'If-None-Match': response.headers['ETag']})
+    assert other.status_code == 200
+    assert b'goodnight' in other.data
+
+    assert client.get('/logs/filter.log?grep=x&since=0').status_code == 400
+
+
+@pytest.mark.parametrize('url', [
+    '/logs/lines.log?lines=abc',
+    '/logs/lines.log?lines=-5&tail=false&format=text',
+    '/logs/batch?files=lines.log&lines=-1',
+])
+def test_invalid_lines_param_returns_400(client, logs_dir, url):
+    """Non-integer or negative ?lines= is a client error, not a 500 or broken stream"""
+    write_log(logs_dir, 'one\ntwo\n', name='lines.log')
+
+    response = client.get(url)
+
+    assert response.status_code == 400
+    assert response.get_json() == {'error': 'lines must be a non-negative integer'}
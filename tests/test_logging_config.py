@@ -0,0 +1,38 @@
+"""
+Tests for logging setup
+
+Covers the QueueHandler/QueueListener handover when setup_logging() is
+called again (e.g. reconfiguring the log file or level).
+"""
+
+import logging
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lib import logging_config
+from lib.logging_config import setup_logging
+
+
+def test_reconfigure_keeps_records_from_old_handler(tmp_path):
+    """Records still routed through the replaced handler reach the new log"""
+    root = logging.getLogger()
+    saved_level = root.level
+    first, second = tmp_path / 'first.log', tmp_path / 'second.log'
+
+    try:
+        setup_logging('INFO', str(first))
+        old_handler = root.handlers[0]
+        setup_logging('INFO', str(second))
+
+        # A thread that picked up the old handler just before the swap
+        old_handler.handle(logging.LogRecord('late', logging.INFO, __file__, 0, 'late record', None, None))
+        logging_config._stop_queue_listener()
+
+        assert 'late record' in second.read_text()
+    finally:
+        # Leave a live default configuration for later tests
+        setup_logging()
+        root.setLevel(saved_level)
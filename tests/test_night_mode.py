@@ -44,6 +44,29 @@ class TestHVACSleepTimeIntegration:
                    "good_morning.py should use transition_to_wake() API"
 
 
+class TestSleepTimeCache:
+    """Tests for the memoized sleep time check used by status endpoints"""
+
+    def test_cached_within_bucket(self):
+        """Test is_sleep_time_cached() evaluates once per time bucket"""
+        from unittest.mock import patch
+        from lib import hvac_logic
+
+        hvac_logic._sleep_time_bucketed.cache_clear()
+        with patch.object(hvac_logic, 'is_sleep_time', return_value=True) as mock_check, \
+             patch.object(hvac_logic.time, 'time', return_value=1000.0) as mock_time:
+            assert hvac_logic.is_sleep_time_cached() is True
+            assert hvac_logic.is_sleep_time_cached() is True
+            assert mock_check.call_count == 1
+
+            # Next bucket re-evaluates
+            mock_time.return_value = 1000.0 + hvac_logic.SLEEP_TIME_CACHE_SECONDS
+            mock_check.return_value = False
+            assert hvac_logic.is_sleep_time_cached() is False
+            assert mock_check.call_count == 2
+        hvac_logic._sleep_time_bucketed.cache_clear()
+
+
 # =============================================================================
 # RUN TESTS
 # =============================================================================